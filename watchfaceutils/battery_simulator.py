@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Battery and Refresh-Cost Simulator
+Replays the graytimer.ino loop() schedule against a mocked RTC for a grid of
+power settings and estimates battery life for each one
+"""
+
+import re
+import itertools
+import numpy as np
+from render_watchface import GFXFont, Watchface
+from generate_all_previews import compose_configured_watchface
+from golden_frames import pack_frame
+from watchface_manifest import INO_PATH, configured_watchfaces
+
+SCREEN_PIXELS = 200 * 200
+
+# Current draw (mA), from the Power Consumption table in docs/README.md.
+# Active polling (~1mA at 200ms) is split into an awake baseline plus a
+# charge per RTC read, so the poll interval matters.
+SLEEP_CURRENT_MA = 0.05    # delay() between polling windows
+POLL_CURRENT_MA = 0.5      # awake inside the polling window
+POLL_CHECK_MAS = 0.1       # charge per RTC read (mA*s)
+PARTIAL_CURRENT_MA = 5.0   # partial refresh
+FULL_CURRENT_MA = 8.0      # full refresh
+
+# Refresh duration model (seconds). A partial refresh costs a fixed
+# waveform plus a share that scales with the number of changed pixels;
+# a full refresh always drives the whole panel.
+PARTIAL_BASE_SEC = 0.25
+PARTIAL_PER_PIXEL_SEC = 0.25 / SCREEN_PIXELS
+FULL_REFRESH_SEC = 1.5
+
+DEFAULT_CAPACITY_MAH = 400  # 300-500mAh recommended
+
+# Minute transitions rendered to measure how many pixels a tick changes
+MINUTE_TRANSITIONS = [
+    ("6:24 AM", "6:25 AM"),
+    ("6:29 AM", "6:30 AM"),
+    ("9:59 AM", "10:00 AM"),
+    ("12:59 PM", "1:00 PM"),
+]
+TRANSITION_DATE = "Jun 24"
+
+CONSTANT_PATTERN = re.compile(r'const\s+\w+\s+(\w+)\s*=\s*(true|false|\d+)\s*;')
+
+
+def read_firmware_constants(ino_path=INO_PATH):
+    """Read the `const ... NAME = value;` settings from graytimer.ino"""
+    with open(ino_path, 'r') as f:
+        content = f.read()
+
+    constants = {}
+    for name, value in CONSTANT_PATTERN.findall(content):
+        if value in ('true', 'false'):
+            constants[name] = value == 'true'
+        else:
+            constants[name] = int(value)
+    return constants
+
+
+def measure_changed_pixels(configs=None, transitions=MINUTE_TRANSITIONS):
+    """
+    Average number of pixels that change on a minute tick, per watchface.
+    Each face is rendered for both sides of every transition and the packed
+    frames are XORed.
+    """
+    if configs is None:
+        configs = configured_watchfaces()
+
+    changed = {}
+    for config in configs:
+        watchface = Watchface(config['watchface_path'])
+        time_font = GFXFont(config['time_font'])
+        date_font = GFXFont(config['date_font'])
+
+        counts = []
+        for before, after in transitions:
+            a = pack_frame(compose_configured_watchface(
+                config, watchface, time_font, date_font, before, TRANSITION_DATE))
+            b = pack_frame(compose_configured_watchface(
+                config, watchface, time_font, date_font, after, TRANSITION_DATE))
+            diff = np.frombuffer(a, dtype=np.uint8) ^ np.frombuffer(b, dtype=np.uint8)
+            counts.append(int(np.unpackbits(diff).sum()))
+        changed[config['name']] = sum(counts) / len(counts)
+    return changed
+
+
+def simulate(wake_sec, poll_ms, full_interval, partial_enabled,
+             changed_pixels, days=1):
+    """
+    Replay loop()/updateDisplay() for every configuration at once.
+
+    All setting arguments are equal-length 1-D arrays (one entry per
+    configuration); changed_pixels is the mean pixels changed by a partial
+    refresh. The mocked RTC is an absolute clock in seconds; each step of
+    the replay is one pass through the minute-change branch of loop().
+
+    Returns a dict of per-configuration arrays: charge (mAh) spent in each
+    state, average current (mA), and counts of late (>1s) and missed minutes.
+    """
+    wake = np.asarray(wake_sec, dtype=np.float64)
+    poll = np.asarray(poll_ms, dtype=np.float64) / 1000.0
+    full_every = np.asarray(full_interval, dtype=np.int64)
+    partial = np.asarray(partial_enabled, dtype=bool)
+
+    count = wake.shape[0]
+    horizon = days * 24 * 3600.0
+    partial_sec = PARTIAL_BASE_SEC + PARTIAL_PER_PIXEL_SEC * changed_pixels
+
+    # First update happens right after setup(), always a full refresh
+    t = np.zeros(count)
+    first = np.ones(count, dtype=bool)
+
+    sleep_s = np.zeros(count)
+    poll_s = np.zeros(count)
+    checks = np.zeros(count)
+    partial_s = np.zeros(count)
+    full_s = np.zeros(count)
+    late = np.zeros(count, dtype=np.int64)
+    missed = np.zeros(count, dtype=np.int64)
+
+    active = t < horizon
+    while active.any():
+        minute = np.floor(t / 60.0).astype(np.int64)
+
+        # updateDisplay(): full on first update, when the RTC's minute of the
+        # hour is a multiple of FULL_REFRESH_INTERVAL, or always when partial
+        # refresh is disabled
+        is_full = first | ~partial | ((minute % 60) % full_every == 0)
+        refresh = np.where(is_full, FULL_REFRESH_SEC, partial_sec)
+        end = t + refresh
+
+        # lastDisplayedMinute = getCurrentMinute() after the refresh
+        last_minute = np.floor(end / 60.0)
+        second = np.floor(end) % 60
+
+        # Sleep until WAKE_BEFORE_MINUTE_SEC, minus 1s for safety
+        sleep = np.where(second < wake, wake - second, (60 - second) + wake)
+        sleep = np.where(sleep > 1, sleep - 1, 0)
+        woke = end + sleep
+
+        # Poll every POLL_INTERVAL_MS until the minute changes
+        boundary = (last_minute + 1) * 60.0
+        polls = np.maximum(1, np.ceil((boundary - woke) / poll))
+        t_next = woke + polls * poll
+
+        full_s += np.where(active & is_full, refresh, 0)
+        partial_s += np.where(active & ~is_full, refresh, 0)
+        sleep_s += np.where(active, sleep, 0)
+        poll_s += np.where(active, t_next - woke, 0)
+        checks += np.where(active, polls, 0)
+        late += (active & (t_next - boundary > 1.0)).astype(np.int64)
+        missed += np.where(active, np.floor(t_next / 60.0) - last_minute - 1, 0).astype(np.int64)
+
+        t = np.where(active, t_next, t)
+        first &= ~active
+        active = t < horizon
+
+    charge = {
+        'sleep': sleep_s * SLEEP_CURRENT_MA / 3600.0,
+        'poll': (poll_s * POLL_CURRENT_MA + checks * POLL_CHECK_MAS) / 3600.0,
+        'partial': partial_s * PARTIAL_CURRENT_MA / 3600.0,
+        'full': full_s * FULL_CURRENT_MA / 3600.0,
+    }
+    total_mah = sum(charge.values())
+    elapsed_h = (sleep_s + poll_s + partial_s + full_s) / 3600.0
+
+    return {
+        'charge_mah': charge,
+        'total_mah': total_mah,
+        'avg_ma': total_mah / elapsed_h,
+        'late': late,
+        'missed': missed,
+    }
+
+
+def parse_values(text):
+    """Parse "1,5,10" or "50-57" (inclusive) into a list of ints"""
+    values = []
+    for part in text.split(','):
+        part = part.strip()
+        if '-' in part:
+            lo, hi = part.split('-')
+            values.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            values.append(int(part))
+    return values
+
+
+def sweep(wake_values, poll_values, full_values, partial_values,
+          changed_pixels, days=1, capacity_mah=DEFAULT_CAPACITY_MAH):
+    """Simulate the full parameter grid; returns a list of result rows"""
+    grid = list(itertools.product(wake_values, poll_values, full_values, partial_values))
+    wake, poll, full_every, partial = (np.array(column) for column in zip(*grid))
+
+    result = simulate(wake, poll, full_every, partial, changed_pixels, days)
+
+    rows = []
+    for i, (w, p, f, pe) in enumerate(grid):
+        avg_ma = float(result['avg_ma'][i])
+        rows.append({
+            'WAKE_BEFORE_MINUTE_SEC': w,
+            'POLL_INTERVAL_MS': p,
+            'FULL_REFRESH_INTERVAL': f,
+            'ENABLE_PARTIAL_REFRESH': bool(pe),
+            'avg_ua': avg_ma * 1000.0,
+            'battery_hours': capacity_mah / avg_ma,
+            'late_per_day': float(result['late'][i]) / days,
+            'missed_per_day': float(result['missed'][i]) / days,
+        })
+    return rows
+
+
+def print_rows(rows, firmware):
+    print(f"{'wake':>5} {'poll':>5} {'full':>5} {'part':>5} {'avg µA':>8} "
+          f"{'hours':>8} {'days':>6} {'late/d':>7} {'miss/d':>7}")
+    for row in rows:
+        marker = '*' if all(row[k] == firmware.get(k) for k in
+                            ('WAKE_BEFORE_MINUTE_SEC', 'POLL_INTERVAL_MS',
+                             'FULL_REFRESH_INTERVAL', 'ENABLE_PARTIAL_REFRESH')) else ' '
+        print(f"{row['WAKE_BEFORE_MINUTE_SEC']:>5} {row['POLL_INTERVAL_MS']:>5} "
+              f"{row['FULL_REFRESH_INTERVAL']:>5} {'yes' if row['ENABLE_PARTIAL_REFRESH'] else 'no':>5} "
+              f"{row['avg_ua']:>8.1f} {row['battery_hours']:>8.1f} {row['battery_hours'] / 24:>6.1f} "
+              f"{row['late_per_day']:>7.1f} {row['missed_per_day']:>7.1f} {marker}")
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Simulate battery life for graytimer.ino power settings')
+    parser.add_argument('--days', type=int, default=1, help='Days to replay (e.g. 1 or 7)')
+    parser.add_argument('--capacity', type=float, default=DEFAULT_CAPACITY_MAH, help='Battery capacity in mAh')
+    parser.add_argument('--wake', default=None, help='WAKE_BEFORE_MINUTE_SEC values, e.g. "50-59" (default: firmware value)')
+    parser.add_argument('--poll', default=None, help='POLL_INTERVAL_MS values, e.g. "100,200,500" (default: firmware value)')
+    parser.add_argument('--full', default=None, help='FULL_REFRESH_INTERVAL values, e.g. "5,10,30" (default: firmware value)')
+    parser.add_argument('--partial', default=None, help='ENABLE_PARTIAL_REFRESH values: "1", "0" or "0,1" (default: firmware value)')
+    parser.add_argument('--grid', action='store_true', help='Sweep a default grid of all four settings')
+    parser.add_argument('--changed-pixels', type=float, help='Skip rendering and use this mean changed-pixel count')
+    parser.add_argument('--top', type=int, default=20, help='Show the N configurations with the longest battery life')
+
+    args = parser.parse_args()
+    firmware = read_firmware_constants()
+
+    if args.grid:
+        args.wake = args.wake or "45-59"
+        args.poll = args.poll or "50,100,200,300,500,1000"
+        args.full = args.full or "1,2,5,10,15,20,30,60"
+        args.partial = args.partial or "0,1"
+
+    wake_values = parse_values(args.wake) if args.wake else [firmware['WAKE_BEFORE_MINUTE_SEC']]
+    poll_values = parse_values(args.poll) if args.poll else [firmware['POLL_INTERVAL_MS']]
+    full_values = parse_values(args.full) if args.full else [firmware['FULL_REFRESH_INTERVAL']]
+    partial_values = [bool(v) for v in parse_values(args.partial)] if args.partial \
+        else [firmware['ENABLE_PARTIAL_REFRESH']]
+
+    if args.changed_pixels is not None:
+        changed_pixels = args.changed_pixels
+    else:
+        per_face = measure_changed_pixels()
+        changed_pixels = sum(per_face.values()) / len(per_face)
+        busiest = max(per_face, key=per_face.get)
+        print(f"Changed pixels per minute tick: mean {changed_pixels:.0f} over {len(per_face)} faces "
+              f"(max {per_face[busiest]:.0f}: {busiest})\n")
+
+    start = time.perf_counter()
+    rows = sweep(wake_values, poll_values, full_values, partial_values,
+                 changed_pixels, args.days, args.capacity)
+    elapsed = time.perf_counter() - start
+
+    rows.sort(key=lambda row: row['battery_hours'], reverse=True)
+    shown = rows[:args.top]
+    current = [row for row in rows if row not in shown and all(
+        row[k] == firmware.get(k) for k in ('WAKE_BEFORE_MINUTE_SEC', 'POLL_INTERVAL_MS',
+                                            'FULL_REFRESH_INTERVAL', 'ENABLE_PARTIAL_REFRESH'))]
+
+    print(f"Simulated {len(rows)} configurations x {args.days} day(s) in {elapsed:.2f}s "
+          f"({args.capacity:.0f}mAh battery)\n")
+    print_rows(shown + current, firmware)
+    print("\n* = current graytimer.ino settings")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Watchface Gallery Builder
+Renders all configured watchfaces straight into contact sheets and
+regenerates the gallery index in docs/GALLERY.md
+"""
+
+import hashlib
+import json
+import os
+from PIL import Image, ImageDraw
+from render_watchface import GFXFont
+from generate_all_previews import render_configured_watchface
+from golden_frames import frame_digest, pack_frame
+from watchface_manifest import load_manifest
+
+SHEET_COLUMNS = 4
+SHEET_ROWS = 3
+THUMB_SIZE = 200
+CAPTION_HEIGHT = 24
+GUTTER = 8
+CAPTION_FONT = "../myfonts/FreeMonoBold10pt7b.h"
+
+GALLERY_DIR = "../docs/gallery"
+GALLERY_MD = "../docs/GALLERY.md"
+MANIFEST_NAME = "manifest.json"
+
+BEGIN_MARKER = "<!-- BEGIN GENERATED GALLERY (watchfaceutils/build_gallery.py) -->"
+END_MARKER = "<!-- END GENERATED GALLERY -->"
+
+
+def render_frames(configs, time_text, date_text):
+    """Render each watchface once; returns {name: (frame, packed-frame SHA-256)}"""
+    frames = {}
+    for config in configs:
+        frame = render_configured_watchface(config, time_text, date_text, save=False, engine='packed')
+        frames[config['name']] = (frame, frame_digest(pack_frame(frame)))
+    return frames
+
+
+def sheet_digest(faces, frames, caption_digest):
+    """Digest of a sheet: its layout, caption font, faces in order and their rendered frames"""
+    hasher = hashlib.sha1()
+    hasher.update(json.dumps([SHEET_COLUMNS, SHEET_ROWS, THUMB_SIZE, CAPTION_HEIGHT, GUTTER]).encode())
+    hasher.update(caption_digest.encode())
+    for name in faces:
+        hasher.update(f"{name}:{frames[name][1]}".encode())
+    return hasher.hexdigest()
+
+
+def load_gallery_manifest(gallery_dir):
+    """Load the previous build's manifest (empty if there is none)"""
+    manifest_path = os.path.join(gallery_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {'faces': {}, 'sheets': []}
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def save_gallery_manifest(gallery_dir, manifest):
+    manifest_path = os.path.join(gallery_dir, MANIFEST_NAME)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def collect_configs():
+    """Configs for every watchface in allWatchFaces[] that has its fonts present"""
+    manifest = load_manifest()
+    for struct_name in manifest['missing']:
+        print(f"⚠️  {struct_name}: Watchface file not found")
+
+    configs = []
+    for config in manifest['active']:
+        if not os.path.exists(config.get('time_font', '')) or \
+                not os.path.exists(config.get('date_font', '')):
+            print(f"⚠️  {config['name']}: Font not found")
+            continue
+        configs.append(config)
+    return configs
+
+
+def compose_sheet(names, frames, caption_font):
+    """
+    Paste the given watchfaces' rendered frames into one contact sheet,
+    each with a border and its name centered underneath.
+    """
+    cell_w = THUMB_SIZE + GUTTER
+    cell_h = THUMB_SIZE + CAPTION_HEIGHT + GUTTER
+    rows = (len(names) + SHEET_COLUMNS - 1) // SHEET_COLUMNS
+    sheet = Image.new('1', (SHEET_COLUMNS * cell_w + GUTTER, rows * cell_h + GUTTER), 1)
+    draw = ImageDraw.Draw(sheet)
+
+    for index, name in enumerate(names):
+        col = index % SHEET_COLUMNS
+        row = index // SHEET_COLUMNS
+        x = GUTTER + col * cell_w
+        y = GUTTER + row * cell_h
+
+        sheet.paste(frames[name][0], (x, y))
+        draw.rectangle((x - 1, y - 1, x + THUMB_SIZE, y + THUMB_SIZE), outline=0)
+
+        # Caption: face name centered under the thumbnail
+        cx, cy, cw, ch = caption_font.get_text_bounds(name)
+        caption_x = x + (THUMB_SIZE - cw) // 2 - cx
+        caption_y = y + THUMB_SIZE + (CAPTION_HEIGHT - ch) // 2 - cy
+        caption_font.render_text(name, caption_x, caption_y, draw)
+
+    return sheet
+
+
+def write_gallery_index(sheets, gallery_md=GALLERY_MD, gallery_dir=GALLERY_DIR):
+    """Replace the generated section of GALLERY.md with the current sheet index"""
+    rel_dir = os.path.relpath(gallery_dir, os.path.dirname(gallery_md))
+    total = sum(len(sheet['faces']) for sheet in sheets)
+
+    lines = [
+        BEGIN_MARKER,
+        "",
+        "## Contact Sheets",
+        "",
+        f"All {total} configured watchfaces, rendered by `watchfaceutils/build_gallery.py`.",
+        "",
+    ]
+    for number, sheet in enumerate(sheets, 1):
+        lines.append(f"### Sheet {number}")
+        lines.append("")
+        lines.append(f'<img src="./{rel_dir}/{sheet["file"]}" width="100%"/>')
+        lines.append("")
+        lines.append(" · ".join(f"`{name}`" for name in sheet['faces']))
+        lines.append("")
+    lines.append(END_MARKER)
+    block = "\n".join(lines)
+
+    with open(gallery_md, 'r') as f:
+        content = f.read()
+
+    if BEGIN_MARKER in content and END_MARKER in content:
+        start = content.index(BEGIN_MARKER)
+        end = content.index(END_MARKER) + len(END_MARKER)
+        content = content[:start] + block + content[end:]
+    elif "## Creating Your Own Watchface" in content:
+        # First run: insert the index above the "Creating" section
+        anchor = content.index("## Creating Your Own Watchface")
+        anchor = content.rindex("---", 0, anchor)
+        content = content[:anchor] + block + "\n\n" + content[anchor:]
+    else:
+        content = content.rstrip('\n') + "\n\n" + block + "\n"
+
+    with open(gallery_md, 'w') as f:
+        f.write(content)
+
+
+def build_gallery(gallery_dir=GALLERY_DIR, gallery_md=GALLERY_MD,
+                  time_text="6:24 AM", date_text="Jun 24", force=False):
+    """Build contact sheets for all configured watchfaces, skipping unchanged sheets"""
+    os.makedirs(gallery_dir, exist_ok=True)
+
+    configs = collect_configs()
+    previous = load_gallery_manifest(gallery_dir)
+    previous_sheets = {s['file']: s['digest'] for s in previous.get('sheets', [])}
+
+    caption_font = GFXFont(CAPTION_FONT)
+    with open(CAPTION_FONT, 'rb') as f:
+        caption_digest = hashlib.sha1(f.read()).hexdigest()
+    frames = render_frames(configs, time_text, date_text)
+    per_sheet = SHEET_COLUMNS * SHEET_ROWS
+    sheets = []
+    rebuilt = 0
+
+    print(f"Building gallery for {len(configs)} watchfaces...\n")
+
+    for start in range(0, len(configs), per_sheet):
+        names = [c['name'] for c in configs[start:start + per_sheet]]
+        file_name = f"sheet_{start // per_sheet + 1:02d}.png"
+        sheet_path = os.path.join(gallery_dir, file_name)
+        digest = sheet_digest(names, frames, caption_digest)
+        sheets.append({'file': file_name, 'faces': names, 'digest': digest})
+
+        if not force and previous_sheets.get(file_name) == digest and os.path.exists(sheet_path):
+            print(f"= {file_name}: unchanged")
+            continue
+
+        sheet = compose_sheet(names, frames, caption_font)
+        sheet.save(sheet_path, optimize=True)
+        del sheet
+        rebuilt += 1
+        print(f"✓ {file_name}: {', '.join(names)}")
+
+    # Drop sheets left over from a larger previous build
+    current_files = {s['file'] for s in sheets}
+    for stale in previous_sheets:
+        stale_path = os.path.join(gallery_dir, stale)
+        if stale not in current_files and os.path.exists(stale_path):
+            os.remove(stale_path)
+            print(f"- {stale}: removed")
+
+    save_gallery_manifest(gallery_dir, {
+        'time_text': time_text,
+        'date_text': date_text,
+        'faces': {name: digest for name, (_, digest) in frames.items()},
+        'sheets': sheets,
+    })
+    write_gallery_index(sheets, gallery_md, gallery_dir)
+
+    print(f"\n{rebuilt}/{len(sheets)} sheets rebuilt")
+    print(f"Gallery index: {gallery_md}")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build watchface contact sheets and the gallery index')
+    parser.add_argument('--gallery-dir', default=GALLERY_DIR, help='Output directory for contact sheets')
+    parser.add_argument('--gallery-md', default=GALLERY_MD, help='Markdown file to update')
+    parser.add_argument('--time', default='6:24 AM', help='Time text to display')
+    parser.add_argument('--date', default='Jun 24', help='Date text to display')
+    parser.add_argument('--force', '-f', action='store_true', help='Rebuild every sheet')
+
+    args = parser.parse_args()
+    build_gallery(args.gallery_dir, args.gallery_md, args.time, args.date, args.force)
@@ -8,6 +8,7 @@ import os
 import sys
 from pathlib import Path
 from render_watchface import render_watchface_preview, GFXFont
+from watchface_manifest import load_manifest
 
 def get_available_fonts():
     """Get list of all available fonts"""
@@ -29,6 +30,82 @@ def get_available_watchfaces():
     return watchfaces
 
 
+def generate_watchface_code(watchface_name, time_x, time_y, time_font_name,
+                            date_x, date_y, date_font_name, no_ampm=False, layout=0,
+                            struct_name=None, bitmap_name=None,
+                            time_color=0, date_color=0, bitmap_color=0,
+                            bitmap_x_start=0, bitmap_y_start=0,
+                            bitmap_x_end=200, bitmap_y_end=200):
+    """
+    Generate the C++ WatchFace struct for a configuration.
+    struct_name/bitmap_name default to names derived from the file name;
+    fields equal to their WatchFace.h defaults are left out.
+    """
+    struct_name = struct_name or f"WatchFace_{watchface_name}"
+    bitmap_name = bitmap_name or f"{watchface_name}_bitmap_{watchface_name}"
+
+    code = f"""
+struct {struct_name} : public WatchFace {{
+  {struct_name}() {{
+    bitmap = {bitmap_name};
+"""
+
+    for field, value, default in (('bitmap_x_start', bitmap_x_start, 0),
+                                  ('bitmap_y_start', bitmap_y_start, 0),
+                                  ('bitmap_x_end', bitmap_x_end, 200),
+                                  ('bitmap_y_end', bitmap_y_end, 200)):
+        if value != default:
+            code += f"    {field} = {value};\n"
+    if bitmap_color:
+        code += "    bitmap_color = GxEPD_WHITE;\n"
+
+    if layout:
+        code += f"    layout = {layout};\n"
+
+    code += f"""
+    text1x = {time_x};
+    text1y = {time_y};
+    text1font = &{time_font_name};
+"""
+    if time_color:
+        code += "    text1color = GxEPD_WHITE;\n"
+
+    code += f"""
+    text2x = {date_x};
+    text2y = {date_y};
+    text2font = &{date_font_name};
+"""
+    if date_color:
+        code += "    text2color = GxEPD_WHITE;\n"
+
+    if no_ampm:
+        code += f"    noAMPM = true;\n"
+
+    code += "  }\n};\n"
+    return code
+
+
+def code_options_from_config(config):
+    """generate_watchface_code() keyword arguments that keep an existing face's names, colors and bitmap window"""
+    if not config:
+        return {}
+    options = {key: config[key] for key in ('time_color', 'date_color', 'bitmap_color',
+                                            'bitmap_x_start', 'bitmap_y_start',
+                                            'bitmap_x_end', 'bitmap_y_end') if key in config}
+    options['struct_name'] = config.get('struct')
+    options['bitmap_name'] = config.get('bitmap')
+    return options
+
+
+def get_current_config(watchface_name):
+    """Get a watchface's existing configuration from the manifest (None if unknown)"""
+    manifest = load_manifest()
+    for config in manifest['active'] + manifest['unused']:
+        if config['name'] == watchface_name:
+            return config
+    return None
+
+
 def select_from_list(items, prompt="Select"):
     """Interactive list selection"""
     print(f"\n{prompt}:")
@@ -132,11 +209,22 @@ def configure_watchface_interactive():
     print("  - Use -1 for x to auto-center")
     print("=" * 60)
 
-    # Initial positions
-    time_x = int(input(f"Time X position [{(200-time_width)//2}]: ").strip() or str((200-time_width)//2))
-    time_y = int(input("Time Y position [20]: ").strip() or "20")
-    date_x = int(input(f"Date X position [{(200-date_width)//2}]: ").strip() or str((200-date_width)//2))
-    date_y = int(input("Date Y position [190]: ").strip() or "190")
+    # Initial positions (default to the face's current configuration, if any)
+    default_time_x, default_time_y = (200-time_width)//2, 20
+    default_date_x, default_date_y = (200-date_width)//2, 190
+    current = get_current_config(watchface_name)
+    code_options = code_options_from_config(current)
+    layout = 0
+    if current:
+        print(f"Current configuration of {watchface_name} loaded as defaults")
+        default_time_x, default_time_y = current['time_x'], current['time_y']
+        default_date_x, default_date_y = current['date_x'], current['date_y']
+        layout = current['layout']
+
+    time_x = int(input(f"Time X position [{default_time_x}]: ").strip() or str(default_time_x))
+    time_y = int(input(f"Time Y position [{default_time_y}]: ").strip() or str(default_time_y))
+    date_x = int(input(f"Date X position [{default_date_x}]: ").strip() or str(default_date_x))
+    date_y = int(input(f"Date Y position [{default_date_y}]: ").strip() or str(default_date_y))
 
     iteration = 0
     while True:
@@ -152,7 +240,14 @@ def configure_watchface_interactive():
             time_x, time_y,
             date_x, date_y,
             time_text, date_text,
-            output_path=output_path
+            output_path=output_path,
+            layout=layout,
+            time_color=code_options.get('time_color', 0),
+            date_color=code_options.get('date_color', 0),
+            bitmap_x_start=code_options.get('bitmap_x_start', 0),
+            bitmap_y_start=code_options.get('bitmap_y_start', 0),
+            bitmap_x_end=code_options.get('bitmap_x_end', 200),
+            bitmap_y_end=code_options.get('bitmap_y_end', 200)
         )
 
         print(f"\nPreview saved: {output_path}")
@@ -187,26 +282,14 @@ def configure_watchface_interactive():
             print("Generated WatchFace Class Code:")
             print("=" * 60)
 
-            class_name = ''.join(word.capitalize() for word in watchface_name.split('_'))
-
-            code = f"""
-struct WatchFace_{watchface_name} : public WatchFace {{
-  WatchFace_{watchface_name}() {{
-    bitmap = {watchface_name}_bitmap_{watchface_name};
-
-    text1x = {time_x};
-    text1y = {time_y};
-    text1font = &{time_font_name};
-
-    text2x = {date_x};
-    text2y = {date_y};
-    text2font = &{date_font_name};
-"""
-
-            if no_ampm:
-                code += f"    noAMPM = true;\n"
-
-            code += "  }\n};\n"
+            code = generate_watchface_code(
+                watchface_name,
+                time_x, time_y, time_font_name,
+                date_x, date_y, date_font_name,
+                no_ampm=no_ampm,
+                layout=layout,
+                **code_options
+            )
 
             print(code)
 
@@ -223,7 +306,8 @@ struct WatchFace_{watchface_name} : public WatchFace {{
             # Update epaper_watch.ino suggestion
             print("\n" + "=" * 60)
             print("To add to epaper_watch.ino, add this line to the allWatchFaces array:")
-            print(f"  new WatchFace_{watchface_name}(),")
+            struct_name = code_options.get('struct_name') or f"WatchFace_{watchface_name}"
+            print(f"  new {struct_name}(),")
             print("=" * 60)
 
             break
@@ -237,6 +321,19 @@ struct WatchFace_{watchface_name} : public WatchFace {{
 
 
 if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Interactive watchface configurator')
+    parser.add_argument('--serve', action='store_true', help='Run the live preview server instead of the CLI')
+    parser.add_argument('--port', '-p', type=int, default=8200, help='Port for --serve')
+
+    args = parser.parse_args()
+
+    if args.serve:
+        from preview_server import serve
+        serve(args.port)
+        sys.exit(0)
+
     try:
         configure_watchface_interactive()
     except (KeyboardInterrupt, EOFError):
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Flash and RAM Budget Analyzer
+Sums the exact PROGMEM bytes of the watchfaces in allWatchFaces[] and the
+fonts they reference, ranks savings candidates and answers what-if questions
+"""
+
+import re
+import sys
+from pathlib import Path
+from render_watchface import AssetCache
+from watchface_manifest import FONT_DIR, load_manifest
+
+# Application flash on the Xiao nRF52840: after the S140 SoftDevice
+# (0x26000) and before the bootloader settings (0xED000)
+APP_FLASH_BYTES = 0xED000 - 0x26000
+RAM_BYTES = 256 * 1024
+
+# Sketch + libraries, from the Memory Usage table in docs/README.md.
+# Pass --code-bytes with the real number from the build output if known.
+DEFAULT_CODE_BYTES = (85 + 68) * 1024
+
+# 32-bit ARM (arm-none-eabi-gcc) sizes
+SIZEOF_GFXGLYPH = 8     # uint16_t + 3 x uint8_t + 2 x int8_t, padded to 2-byte alignment
+SIZEOF_GFXFONT = 16     # 2 pointers + 2 x uint16_t + uint8_t, padded to 4-byte alignment
+SIZEOF_WATCHFACE = 64   # WatchFace.h: 3 pointers, 9 ints, 3 uint16_t, 1 bool (55 bytes) + 9 padding
+HEAP_OVERHEAD = 8       # newlib malloc chunk header per `new WatchFace_*()`
+SIZEOF_POINTER = 4      # allWatchFaces[] entry
+
+FONT_SLOTS = {
+    'text1font': 'time_font', 'time': 'time_font',
+    'text2font': 'date_font', 'date': 'date_font',
+}
+
+FONT_NAME_PATTERN = re.compile(r'^(?P<family>.+?)(?P<size>\d+)pt(?P<bits>[78])b$')
+
+
+def font_bytes(font):
+    """Bitmaps[] + Glyphs[] + the GFXfont struct"""
+    return len(font.bitmap) + SIZEOF_GFXGLYPH * len(font.glyphs) + SIZEOF_GFXFONT
+
+
+def face_bytes(watchface):
+    """The 200x200 bitmap (5000 bytes); the constructor code is not counted"""
+    return len(watchface.bitmap)
+
+
+def font_family(font_name):
+    """Split e.g. 'Orbitron_Medium20pt7b' into ('Orbitron_Medium', 20, '7'), or None"""
+    match = FONT_NAME_PATTERN.match(font_name)
+    if not match:
+        return None
+    return match.group('family'), int(match.group('size')), match.group('bits')
+
+
+def compute_budget(configs, assets, code_bytes=DEFAULT_CODE_BYTES):
+    """
+    Flash and RAM use for a list of watchface configs.
+    Fonts shared by several faces are counted once, as the linker keeps a
+    single copy; faces and fonts that are not referenced are left out, as
+    --gc-sections drops them.
+    """
+    faces = {}
+    fonts = {}
+    missing = []
+
+    for config in configs:
+        faces[config['name']] = face_bytes(assets.get_watchface(config['watchface_path']))
+        for key in ('time_font', 'date_font'):
+            font_path = config.get(key)
+            if font_path is None:
+                continue
+            if font_path not in fonts:
+                if not Path(font_path).exists():
+                    missing.append((config['name'], font_path))
+                    continue
+                fonts[font_path] = {'bytes': font_bytes(assets.get_font(font_path)), 'users': set()}
+            fonts[font_path]['users'].add(config['name'])
+
+    face_total = sum(faces.values())
+    font_total = sum(font['bytes'] for font in fonts.values())
+    count = len(configs)
+
+    return {
+        'faces': faces,
+        'fonts': fonts,
+        'missing': missing,
+        'face_bytes': face_total,
+        'font_bytes': font_total,
+        'code_bytes': code_bytes,
+        'flash_bytes': code_bytes + face_total + font_total,
+        'ram_bytes': count * (SIZEOF_WATCHFACE + HEAP_OVERHEAD + SIZEOF_POINTER),
+    }
+
+
+def available_fonts(font_dir=FONT_DIR):
+    """Font name -> path for every font header in myfonts/"""
+    return {p.stem: str(p) for p in sorted(Path(font_dir).glob("*.h"))}
+
+
+def apply_what_if(configs, remove=(), swaps=(), add=(), extra_configs=(), font_dir=FONT_DIR):
+    """
+    Return a modified copy of configs.
+      remove: watchface names to drop
+      swaps: 'face:slot=FontName' strings (slot: text1font/time or text2font/date)
+      add: names of unused watchfaces (from extra_configs) to append
+    Raises ValueError for unknown faces, slots or fonts.
+    """
+    configs = [dict(config) for config in configs]
+    names = {config['name'] for config in configs}
+
+    for name in remove:
+        if name not in names:
+            raise ValueError(f"Unknown watchface: {name}")
+        configs = [config for config in configs if config['name'] != name]
+        names.discard(name)
+
+    extra = {config['name']: config for config in extra_configs}
+    for name in add:
+        if name in names:
+            raise ValueError(f"Watchface already configured: {name}")
+        if name not in extra:
+            raise ValueError(f"Unknown watchface: {name}")
+        configs.append(dict(extra[name]))
+        names.add(name)
+
+    fonts = available_fonts(font_dir)
+    for spec in swaps:
+        try:
+            target, font_name = spec.split('=', 1)
+            name, slot = target.split(':', 1)
+        except ValueError:
+            raise ValueError(f"Swap must look like face:text1font=FontName, got {spec!r}")
+        if slot not in FONT_SLOTS:
+            raise ValueError(f"Unknown font slot {slot!r} (use text1font/time or text2font/date)")
+        if font_name not in fonts:
+            raise ValueError(f"Unknown font: {font_name}")
+        matches = [config for config in configs if config['name'] == name]
+        if not matches:
+            raise ValueError(f"Unknown watchface: {name}")
+        matches[0][FONT_SLOTS[slot]] = fonts[font_name]
+
+    return configs
+
+
+def savings_candidates(configs, assets, budget, font_dir=FONT_DIR):
+    """
+    Rank single changes by flash saved:
+      - removing a face (its bitmap plus any fonts only it uses)
+      - swapping a face's font for a smaller size of the same family
+    """
+    candidates = []
+    baseline = budget['flash_bytes']
+
+    for config in configs:
+        name = config['name']
+        exclusive = {path for path, font in budget['fonts'].items() if font['users'] == {name}}
+        saved = budget['faces'][name] + sum(budget['fonts'][path]['bytes'] for path in exclusive)
+        detail = f"bitmap + {len(exclusive)} exclusive font(s)" if exclusive else "bitmap only"
+        candidates.append({'saved': saved, 'change': f"--remove {name}", 'detail': detail})
+
+    fonts = available_fonts(font_dir)
+    by_family = {}
+    for font_name in fonts:
+        family = font_family(font_name)
+        if family:
+            by_family.setdefault((family[0], family[2]), []).append((family[1], font_name))
+
+    for config in configs:
+        for slot, key in (('text1font', 'time_font'), ('text2font', 'date_font')):
+            current = Path(config.get(key, '')).stem
+            family = font_family(current)
+            if not family:
+                continue
+            for size, font_name in sorted(by_family.get((family[0], family[2]), [])):
+                if size >= family[1]:
+                    continue
+                swap = f"{config['name']}:{slot}={font_name}"
+                after = compute_budget(apply_what_if(configs, swaps=[swap], font_dir=font_dir),
+                                       assets, budget['code_bytes'])
+                saved = baseline - after['flash_bytes']
+                if saved > 0:
+                    candidates.append({'saved': saved, 'change': f"--swap {swap}",
+                                       'detail': f"{current} → {font_name} (smaller text)"})
+
+    candidates.sort(key=lambda c: c['saved'], reverse=True)
+    return candidates
+
+
+def print_budget(budget, flash_limit=APP_FLASH_BYTES, title="Flash Budget"):
+    flash = budget['flash_bytes']
+    print(f"=== {title} ({len(budget['faces'])} watchfaces, {len(budget['fonts'])} fonts) ===")
+    print(f"  Watchface bitmaps:     {budget['face_bytes']:>9,} bytes")
+    print(f"  Fonts (deduplicated):  {budget['font_bytes']:>9,} bytes")
+    print(f"  Firmware code (est.):  {budget['code_bytes']:>9,} bytes")
+    print(f"  Total:                 {flash:>9,} / {flash_limit:,} bytes "
+          f"({flash / flash_limit * 100:.1f}%, {flash_limit - flash:,} free)")
+    if flash > flash_limit:
+        print(f"  ✗ Over the application flash limit by {flash - flash_limit:,} bytes")
+    print(f"  RAM (WatchFace objects + allWatchFaces[]): {budget['ram_bytes']:,} bytes "
+          f"({budget['ram_bytes'] / RAM_BYTES * 100:.1f}% of {RAM_BYTES // 1024}KB)")
+    for name, font_path in budget['missing']:
+        print(f"  ⚠️  {name}: font not found ({font_path})")
+
+
+def print_fonts(budget, top):
+    print(f"\n=== Largest Fonts ===")
+    fonts = sorted(budget['fonts'].items(), key=lambda item: item[1]['bytes'], reverse=True)
+    for font_path, font in fonts[:top]:
+        users = sorted(font['users'])
+        shown = ', '.join(users[:3]) + (f" +{len(users) - 3}" if len(users) > 3 else "")
+        print(f"  {font['bytes']:>7,}  {Path(font_path).stem:<36} {len(users):>2} face(s): {shown}")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Flash and RAM budget for the configured watchfaces')
+    parser.add_argument('--flash-limit', type=int, default=APP_FLASH_BYTES, help='Application flash in bytes')
+    parser.add_argument('--code-bytes', type=int, default=DEFAULT_CODE_BYTES,
+                        help='Firmware code size in bytes (sketch + libraries)')
+    parser.add_argument('--top', type=int, default=10, help='Number of fonts and savings candidates to show')
+    parser.add_argument('--remove', action='append', default=[], metavar='FACE',
+                        help='What-if: drop a watchface (repeatable)')
+    parser.add_argument('--add', action='append', default=[], metavar='FACE',
+                        help='What-if: add an unused watchface (repeatable)')
+    parser.add_argument('--swap', action='append', default=[], metavar='FACE:SLOT=FONT',
+                        help='What-if: swap a font, e.g. atat:text1font=StarJedi_DGRW10pt7b (repeatable)')
+
+    args = parser.parse_args()
+
+    manifest = load_manifest()
+    configs = manifest['active']
+    assets = AssetCache()
+
+    budget = compute_budget(configs, assets, args.code_bytes)
+    print_budget(budget, args.flash_limit)
+    for struct_name in manifest['missing']:
+        print(f"  ⚠️  {struct_name}: Watchface file not found")
+
+    if args.remove or args.add or args.swap:
+        try:
+            modified = apply_what_if(configs, args.remove, args.swap, args.add, manifest['unused'])
+        except ValueError as e:
+            print(f"\n✗ {e}")
+            sys.exit(1)
+
+        after = compute_budget(modified, assets, args.code_bytes)
+        print()
+        print_budget(after, args.flash_limit, title="What-if")
+        delta = after['flash_bytes'] - budget['flash_bytes']
+        print(f"\nFlash change: {delta:+,} bytes; RAM change: {after['ram_bytes'] - budget['ram_bytes']:+,} bytes")
+    else:
+        print_fonts(budget, args.top)
+
+        print(f"\n=== Savings Candidates ===")
+        for candidate in savings_candidates(configs, assets, budget)[:args.top]:
+            print(f"  {candidate['saved']:>7,}  {candidate['change']:<56} {candidate['detail']}")
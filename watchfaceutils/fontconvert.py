@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+TTF/OTF to Adafruit GFX Font Converter
+Rasterizes fonts with Pillow and writes myfonts/-style .h files at several
+sizes in one pass, verifying each output by loading it back through GFXFont
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
+from render_watchface import GFXFont
+
+# fontconvert renders at 141 DPI (the Adafruit displays' approximate density)
+DPI = 141
+DEFAULT_SIZES = [10, 20, 30, 40]
+DEFAULT_FIRST = 0x20
+DEFAULT_LAST = 0x7E
+
+
+def font_name(font_path, size, last=DEFAULT_LAST):
+    """fontconvert's naming: sanitized file stem + size + 'pt7b' (or 'pt8b')"""
+    stem = re.sub(r'[^0-9A-Za-z]', '_', Path(font_path).stem)
+    return f"{stem}{size}pt{7 if last < 0x80 else 8}b"
+
+
+def pack_bits(image):
+    """Pack a '1' glyph image row by row into a continuous MSB-first bit stream"""
+    width, height = image.size
+    pixels = image.load()
+    out = []
+    acc = 0
+    bit = 0
+    for y in range(height):
+        for x in range(width):
+            acc = (acc << 1) | (1 if pixels[x, y] else 0)
+            bit += 1
+            if bit == 8:
+                out.append(acc)
+                acc = 0
+                bit = 0
+    if bit:
+        out.append(acc << (8 - bit))
+    return out
+
+
+def rasterize_font(font_path, size, first=DEFAULT_FIRST, last=DEFAULT_LAST):
+    """
+    Rasterize characters first..last at `size` points.
+    Returns (bitmap bytes, glyph tuples, yAdvance); each glyph is
+    (bitmapOffset, width, height, xAdvance, xOffset, yOffset) with offsets
+    relative to the cursor on the baseline, as in GFXglyph.
+    """
+    ppem = size * DPI / 72
+    font = ImageFont.truetype(str(font_path), ppem)
+
+    # Draw each glyph on a canvas with room on every side of the origin
+    canvas_size = int(ppem * 4)
+    origin = (canvas_size // 4, canvas_size // 2)
+
+    bitmap = []
+    glyphs = []
+    for code in range(first, last + 1):
+        char = chr(code)
+        canvas = Image.new('1', (canvas_size, canvas_size), 0)
+        ImageDraw.Draw(canvas).text(origin, char, font=font, fill=1, anchor='ls')
+
+        x_advance = int(font.getlength(char))
+        bbox = canvas.getbbox()
+        if bbox is None:
+            # Empty glyph (e.g. space): a single blank pixel, as fontconvert writes it
+            glyphs.append((len(bitmap), 1, 1, x_advance, 0, 0))
+            bitmap.append(0x00)
+            continue
+
+        left, top, right, bottom = bbox
+        glyphs.append((len(bitmap), right - left, bottom - top, x_advance,
+                       left - origin[0], top - origin[1]))
+        bitmap.extend(pack_bits(canvas.crop(bbox)))
+
+    # FreeType's size->metrics.height, which fontconvert writes as yAdvance
+    return bitmap, glyphs, font.font.height
+
+
+def format_font(name, bitmap, glyphs, y_advance, first=DEFAULT_FIRST, last=DEFAULT_LAST):
+    """Format the font as a .h file in fontconvert's exact layout"""
+    lines = [f"const uint8_t {name}Bitmaps[] PROGMEM = {{"]
+    for i in range(0, len(bitmap), 12):
+        row = ", ".join(f"0x{b:02X}" for b in bitmap[i:i + 12])
+        lines.append(f"  {row}{',' if i + 12 < len(bitmap) else ' };'}")
+    lines.append("")
+
+    lines.append(f"const GFXglyph {name}Glyphs[] PROGMEM = {{")
+    for index, glyph in enumerate(glyphs):
+        code = first + index
+        entry = "  {{ {:5d}, {:3d}, {:3d}, {:3d}, {:4d}, {:4d} }}".format(*glyph)
+        tail = " }; // " if index == len(glyphs) - 1 else ",   // "
+        lines.append(f"{entry}{tail}0x{code:02X} '{chr(code)}'")
+    lines.append("")
+
+    lines.append(f"const GFXfont {name} PROGMEM = {{")
+    lines.append(f"  (uint8_t  *){name}Bitmaps,")
+    lines.append(f"  (GFXglyph *){name}Glyphs,")
+    lines.append(f"  0x{first:02X}, 0x{last:02X}, {y_advance} }};")
+    lines.append("")
+
+    # Same estimate fontconvert prints: bitmap + 7 bytes/glyph + 7 for the font
+    approx = len(bitmap) + len(glyphs) * 7 + 7
+    lines.append(f"// Approx. {approx} bytes")
+    return "\n".join(lines) + "\n"
+
+
+def verify_font(output_path, bitmap, glyphs, y_advance, first, last):
+    """Load a written font through GFXFont and check it round-trips exactly"""
+    font = GFXFont(output_path)
+    parsed = [(g['bitmapOffset'], g['width'], g['height'], g['xAdvance'],
+               g['xOffset'], g['yOffset']) for g in font.glyphs]
+
+    problems = []
+    if font.bitmap != bitmap:
+        problems.append(f"bitmap mismatch ({len(font.bitmap)} vs {len(bitmap)} bytes)")
+    if parsed != list(glyphs):
+        problems.append(f"glyph mismatch ({len(parsed)} vs {len(glyphs)} glyphs)")
+    if (font.first_char, font.last_char, font.y_advance) != (first, last, y_advance):
+        problems.append("GFXfont header mismatch")
+    return problems
+
+
+def convert_font(font_path, size, output_dir, first=DEFAULT_FIRST, last=DEFAULT_LAST):
+    """
+    Convert one font at one size and verify the result.
+    Returns a result dict (runs in a worker process).
+    """
+    name = font_name(font_path, size, last)
+    output_path = os.path.join(output_dir, f"{name}.h")
+    try:
+        bitmap, glyphs, y_advance = rasterize_font(font_path, size, first, last)
+        with open(output_path, 'w') as f:
+            f.write(format_font(name, bitmap, glyphs, y_advance, first, last))
+        problems = verify_font(output_path, bitmap, glyphs, y_advance, first, last)
+        return {'name': name, 'path': output_path, 'bytes': len(bitmap) + len(glyphs) * 7 + 7,
+                'y_advance': y_advance, 'problems': problems}
+    except OSError as e:
+        return {'name': name, 'path': output_path, 'problems': [str(e)]}
+
+
+def convert_fonts(font_paths, sizes=DEFAULT_SIZES, output_dir="../myfonts",
+                  first=DEFAULT_FIRST, last=DEFAULT_LAST, workers=None):
+    """Convert every font at every size on a process pool; returns the result dicts"""
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(font_path, size) for font_path in font_paths for size in sizes]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(convert_font, font_path, size, output_dir, first, last)
+                   for font_path, size in jobs]
+        return [future.result() for future in futures]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert TTF/OTF fonts to Adafruit GFX .h files')
+    parser.add_argument('fonts', nargs='+', help='Font files (or installed font file names, e.g. DejaVuSans.ttf)')
+    parser.add_argument('--sizes', '-s', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Point sizes to generate (default: 10 20 30 40)')
+    parser.add_argument('--output-dir', '-o', default='../myfonts', help='Output directory')
+    parser.add_argument('--first', type=lambda v: int(v, 0), default=DEFAULT_FIRST, help='First character (default: 0x20)')
+    parser.add_argument('--last', type=lambda v: int(v, 0), default=DEFAULT_LAST, help='Last character (default: 0x7E)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+
+    print(f"Converting {len(args.fonts)} font(s) at sizes {', '.join(map(str, args.sizes))}...\n")
+    results = convert_fonts(args.fonts, args.sizes, args.output_dir, args.first, args.last, args.workers)
+
+    failed = 0
+    for result in results:
+        if result['problems']:
+            failed += 1
+            print(f"✗ {result['name']}: {'; '.join(result['problems'])}")
+        else:
+            print(f"✓ {result['name']}: ~{result['bytes']} bytes, yAdvance {result['y_advance']} → {result['path']}")
+
+    print(f"\n{len(results) - failed}/{len(results)} fonts converted and verified")
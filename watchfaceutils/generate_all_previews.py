@@ -1,169 +1,229 @@
 #!/usr/bin/env python3
 """
 Generate preview images for all configured watchfaces
-Automatically parses .h files to extract configuration
+Loads watchface configuration from the cached manifest (watchface_manifest.py)
 """
 
 import re
 import os
+import time
 from pathlib import Path
-from render_watchface import render_watchface_preview
-
-def parse_watchface_config(watchface_h_path):
-    """
-    Parse a watchface .h file to extract configuration
-    Returns dict with font paths and positions
-    """
-    with open(watchface_h_path, 'r') as f:
-        content = f.read()
-
-    config = {
-        'name': Path(watchface_h_path).stem,
-        'watchface_path': watchface_h_path,
-        'time_x': -1,  # Default to center
-        'time_y': -1,
-        'date_x': -1,
-        'date_y': -1,
-        'layout': 0,   # Default to single-line (matches WatchFace.h default)
-    }
-
-    # Extract font assignments
-    time_font_match = re.search(r'text1font\s*=\s*&(\w+);', content)
-    date_font_match = re.search(r'text2font\s*=\s*&(\w+);', content)
-
-    if time_font_match:
-        font_name = time_font_match.group(1)
-        config['time_font'] = f"../myfonts/{font_name}.h"
-
-    if date_font_match:
-        font_name = date_font_match.group(1)
-        config['date_font'] = f"../myfonts/{font_name}.h"
-
-    # Extract positions (percentages 0-100 or -1 for center)
-    text1x_match = re.search(r'text1x\s*=\s*(-?\d+);', content)
-    text1y_match = re.search(r'text1y\s*=\s*(-?\d+);', content)
-    text2x_match = re.search(r'text2x\s*=\s*(-?\d+);', content)
-    text2y_match = re.search(r'text2y\s*=\s*(-?\d+);', content)
-
-    if text1x_match:
-        config['time_x'] = int(text1x_match.group(1))
-    if text1y_match:
-        config['time_y'] = int(text1y_match.group(1))
-    if text2x_match:
-        config['date_x'] = int(text2x_match.group(1))
-    if text2y_match:
-        config['date_y'] = int(text2y_match.group(1))
-
-    # Extract layout
-    layout_match = re.search(r'layout\s*=\s*(\d+);', content)
-    if layout_match:
-        config['layout'] = int(layout_match.group(1))
-
-    # Check for noAMPM flag
-    no_ampm_match = re.search(r'noAMPM\s*=\s*(true|false);', content)
-    if no_ampm_match:
-        config['noAMPM'] = no_ampm_match.group(1) == 'true'
-
-    # Extract text colors (GxEPD_BLACK=0, GxEPD_WHITE=1)
-    text1color_match = re.search(r'text1color\s*=\s*GxEPD_(BLACK|WHITE);', content)
-    text2color_match = re.search(r'text2color\s*=\s*GxEPD_(BLACK|WHITE);', content)
-
-    config['time_color'] = 1 if (text1color_match and text1color_match.group(1) == 'WHITE') else 0
-    config['date_color'] = 1 if (text2color_match and text2color_match.group(1) == 'WHITE') else 0
-
-    # Extract bitmap positioning
-    bitmap_x_start_match = re.search(r'bitmap_x_start\s*=\s*(\d+);', content)
-    bitmap_y_start_match = re.search(r'bitmap_y_start\s*=\s*(\d+);', content)
-    bitmap_x_end_match = re.search(r'bitmap_x_end\s*=\s*(\d+);', content)
-    bitmap_y_end_match = re.search(r'bitmap_y_end\s*=\s*(\d+);', content)
-
-    if bitmap_x_start_match:
-        config['bitmap_x_start'] = int(bitmap_x_start_match.group(1))
-    if bitmap_y_start_match:
-        config['bitmap_y_start'] = int(bitmap_y_start_match.group(1))
-    if bitmap_x_end_match:
-        config['bitmap_x_end'] = int(bitmap_x_end_match.group(1))
-    if bitmap_y_end_match:
-        config['bitmap_y_end'] = int(bitmap_y_end_match.group(1))
-
-    return config
+from render_watchface import render_watchface_preview, compose_watchface_frame, AssetCache
+from watchface_manifest import INO_PATH, load_manifest, parse_watchface_config
+from preview_writer import PreviewWriter, DEFAULT_WORKERS, DEFAULT_COMPRESS_LEVEL
+
+
+def display_time_text(config, time_text):
+    """Drop AM/PM from the time text if the watchface sets noAMPM"""
+    if config.get('noAMPM', False):
+        return time_text.replace(' AM', '').replace(' PM', '')
+    return time_text
+
+
+def render_configured_watchface(config, time_text="6:24 AM", date_text="Jun 24",
+                                output_path=None, save=True, engine='pil'):
+    """Render a watchface from a parsed config (see parse_watchface_config)"""
+    return render_watchface_preview(
+        config['watchface_path'],
+        config['time_font'],
+        config['date_font'],
+        config.get('time_x', -1),
+        config.get('time_y', -1),
+        config.get('date_x', -1),
+        config.get('date_y', -1),
+        display_time_text(config, time_text),
+        date_text,
+        output_path=output_path,
+        layout=config.get('layout', 0),
+        time_color=config.get('time_color', 0),
+        date_color=config.get('date_color', 0),
+        bitmap_x_start=config.get('bitmap_x_start', 0),
+        bitmap_y_start=config.get('bitmap_y_start', 0),
+        bitmap_x_end=config.get('bitmap_x_end', 200),
+        bitmap_y_end=config.get('bitmap_y_end', 200),
+        save=save,
+        bitmap_color=config.get('bitmap_color', 0),
+        engine=engine
+    )
+
+
+def compose_configured_watchface(config, watchface, time_font, date_font,
+                                 time_text="6:24 AM", date_text="Jun 24", engine='pil'):
+    """Like render_configured_watchface, but with already-parsed Watchface/GFXFont objects"""
+    return compose_watchface_frame(
+        watchface, time_font, date_font,
+        config.get('time_x', -1),
+        config.get('time_y', -1),
+        config.get('date_x', -1),
+        config.get('date_y', -1),
+        display_time_text(config, time_text),
+        date_text,
+        layout=config.get('layout', 0),
+        time_color=config.get('time_color', 0),
+        date_color=config.get('date_color', 0),
+        bitmap_x_start=config.get('bitmap_x_start', 0),
+        bitmap_y_start=config.get('bitmap_y_start', 0),
+        bitmap_x_end=config.get('bitmap_x_end', 200),
+        bitmap_y_end=config.get('bitmap_y_end', 200),
+        bitmap_color=config.get('bitmap_color', 0),
+        engine=engine
+    )
 
 
 def generate_all_configured_watchfaces(output_dir="previews",
                                        time_text="6:24 AM",
-                                       date_text="Jun 24"):
-    """Generate preview images for all configured watchfaces"""
+                                       date_text="Jun 24",
+                                       workers=DEFAULT_WORKERS,
+                                       compress_level=DEFAULT_COMPRESS_LEVEL,
+                                       archive=None,
+                                       engine='pil'):
+    """
+    Generate preview images for all configured watchfaces.
+    Rendering runs on this thread; PNG encoding and writes are handed to a
+    bounded PreviewWriter pool (or streamed into `archive`, a .zip/.tar path).
+    """
 
-    # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
+    # Configured watchfaces come from allWatchFaces[] in graytimer.ino
+    manifest = load_manifest()
+    configured_watchfaces = manifest['active']
 
-    # Find all configured watchfaces from epaper_watch.ino
-    configured_watchfaces = [
-        'atat', 'atdp', 'b1', 'bird', 'bird2', 'bugs', 'crow', 'dog', 'giraffe1', 'mountain2', 'stormtrooper3_floyd',
-        'h', 'krishna', 'macaw', 'mountain1', 'peacock', 'peacock3', 'pegasus', 'squares_invert', 'squares',
-        'stormtrooper2', 'tom', 'bugs', 'tree', 'walker', 'xwing', 'zebra', 'ben10', 'claw', 'claw2', 'claw3',
-        'guitar1', 'guitar2', 'harley', 'harry934', 'herbert', 'hogwarts', 'hogwarts2', 'hogwarts3', 'hogwarts4', 'jitsu1',
-        'jitsu2', 'jitsu3', 'jitsu4', 'jitsu5', 'mikew', 'penguin_beatles', 'penguins', 'planets', 'ps', 'saturn',
-        'sensei', 'sortinghat', 'sullivan', 'thiruman'
-    ]
+    for struct_name in manifest['missing']:
+        print(f"⚠️  {struct_name}: Watchface file not found")
 
     print(f"Generating previews for {len(configured_watchfaces)} watchfaces...\n")
 
-    success_count = 0
-    for wf_name in configured_watchfaces:
-        wf_path = f"../mywatchfaces/{wf_name}.h"
+    with PreviewWriter(output_dir, archive, workers=workers,
+                       compress_level=compress_level) as writer:
+        for config in configured_watchfaces:
+            wf_name = config['name']
 
-        if not os.path.exists(wf_path):
-            print(f"⚠️  {wf_name}: Watchface file not found")
-            continue
+            try:
+                # Check if fonts exist
+                if 'time_font' not in config or not os.path.exists(config['time_font']):
+                    print(f"⚠️  {wf_name}: Time font not found")
+                    continue
+
+                if 'date_font' not in config or not os.path.exists(config['date_font']):
+                    print(f"⚠️  {wf_name}: Date font not found")
+                    continue
+
+                # Render preview; the writer pool encodes and saves it
+                image = render_configured_watchface(config, time_text, date_text, save=False,
+                                                    engine=engine)
+                writer.submit(image, f"{wf_name}.png")
+                print(f"✓ {wf_name}")
+
+            except Exception as e:
+                print(f"✗ {wf_name}: Error - {e}")
+
+    for wf_file, e in writer.errors:
+        print(f"✗ {wf_file}: Write error - {e}")
 
+    print(f"\n{writer.written}/{len(configured_watchfaces)} watchfaces rendered successfully")
+    print(f"Output: {writer.destination}")
+
+
+def build_font_dependencies(configs):
+    """Map each font path to the names of the watchfaces that use it"""
+    dependents = {}
+    for config in configs:
+        for key in ('time_font', 'date_font'):
+            if key in config:
+                dependents.setdefault(config[key], set()).add(config['name'])
+    return dependents
+
+
+def snapshot_sources(watchface_dir="../mywatchfaces", font_dir="../myfonts",
+                     ino_path=INO_PATH):
+    """(mtime_ns, size) of every face, font and the .ino, keyed by path"""
+    paths = [str(p) for p in Path(watchface_dir).glob("*.h")]
+    paths += [str(p) for p in Path(font_dir).glob("*.h")]
+    paths.append(ino_path)
+
+    snapshot = {}
+    for path in paths:
         try:
-            # Parse configuration from .h file
-            config = parse_watchface_config(wf_path)
+            st = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
 
-            # Check if fonts exist
-            if 'time_font' not in config or not os.path.exists(config['time_font']):
-                print(f"⚠️  {wf_name}: Time font not found")
-                continue
 
-            if 'date_font' not in config or not os.path.exists(config['date_font']):
-                print(f"⚠️  {wf_name}: Date font not found")
+def watch_and_regenerate(output_dir="previews", time_text="6:24 AM", date_text="Jun 24",
+                         interval=0.25, engine='pil'):
+    """
+    Watch mywatchfaces/, myfonts/ and graytimer.ino and re-render only the
+    previews affected by each change. Parsed faces and fonts stay in memory;
+    a font edit re-renders the faces that use it (via the font -> face
+    dependency graph), a face edit re-renders that face.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    cache = AssetCache()
+
+    def render(config):
+        start = time.perf_counter()
+        image = compose_configured_watchface(
+            config,
+            cache.get_watchface(config['watchface_path']),
+            cache.get_font(config['time_font']),
+            cache.get_font(config['date_font']),
+            time_text, date_text, engine)
+        output_path = os.path.join(output_dir, f"{config['name']}.png")
+        image.save(output_path)
+        print(f"↻ {config['name']}: {output_path} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    def render_all(names):
+        for name in sorted(names):
+            config = configs[name]
+            try:
+                render(config)
+            except Exception as e:
+                print(f"✗ {name}: Error - {e}")
+
+    configs = {c['name']: c for c in load_manifest()['active']}
+    dependents = build_font_dependencies(configs.values())
+    snapshot = snapshot_sources()
+
+    print(f"Rendering {len(configs)} watchfaces...")
+    render_all(configs)
+    print(f"\nWatching ../mywatchfaces, ../myfonts and {INO_PATH} (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot_sources()
+            changed = {p for p in set(snapshot) | set(current) if snapshot.get(p) != current.get(p)}
+            snapshot = current
+            if not changed:
                 continue
 
-            # Adjust time text if noAMPM is set
-            display_time = time_text
-            if config.get('noAMPM', False):
-                display_time = time_text.replace(' AM', '').replace(' PM', '')
-
-            # Render preview
-            output_path = os.path.join(output_dir, f"{wf_name}.png")
-            render_watchface_preview(
-                config['watchface_path'],
-                config['time_font'],
-                config['date_font'],
-                config.get('time_x', -1),
-                config.get('time_y', -1),
-                config.get('date_x', -1),
-                config.get('date_y', -1),
-                display_time,
-                date_text,
-                output_path=output_path,
-                layout=config.get('layout', 0),
-                time_color=config.get('time_color', 0),
-                date_color=config.get('date_color', 0),
-                bitmap_x_start=config.get('bitmap_x_start', 0),
-                bitmap_y_start=config.get('bitmap_y_start', 0),
-                bitmap_x_end=config.get('bitmap_x_end', 200),
-                bitmap_y_end=config.get('bitmap_y_end', 200)
-            )
-            print(f"✓ {wf_name}: {output_path}")
-            success_count += 1
-
-        except Exception as e:
-            print(f"✗ {wf_name}: Error - {e}")
-
-    print(f"\n{success_count}/{len(configured_watchfaces)} watchfaces rendered successfully")
-    print(f"Output directory: {output_dir}/")
+            start = time.perf_counter()
+            dirty = set()
+            for path in changed:
+                cache.invalidate(path)
+                dirty |= dependents.get(path, set())
+
+            # Face or .ino edits can change configs; the manifest only
+            # re-parses the files that changed
+            if any(not p.startswith("../myfonts/") for p in changed):
+                new_configs = {c['name']: c for c in load_manifest()['active']}
+                for name, config in new_configs.items():
+                    if configs.get(name) != config or config['watchface_path'] in changed:
+                        dirty.add(name)
+                configs = new_configs
+                dependents = build_font_dependencies(configs.values())
+
+            dirty &= set(configs)
+            for path in sorted(changed):
+                print(f"\n• {path} changed")
+            if dirty:
+                render_all(dirty)
+                print(f"  {len(dirty)} preview(s) updated in {(time.perf_counter() - start) * 1000:.0f} ms")
+            else:
+                print("  no configured watchface affected")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
 
 
 def list_all_watchfaces_and_fonts():
@@ -206,10 +266,22 @@ if __name__ == '__main__':
     parser.add_argument('--time', default='6:24 AM', help='Time text to display')
     parser.add_argument('--date', default='Jun 24', help='Date text to display')
     parser.add_argument('--list', '-l', action='store_true', help='List all available watchfaces and fonts')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='PNG writer threads')
+    parser.add_argument('--compress-level', type=int, default=DEFAULT_COMPRESS_LEVEL, choices=range(10),
+                        metavar='0-9', help='PNG zlib compression level')
+    parser.add_argument('--archive', help='Write into a single .zip/.tar/.tar.gz instead of loose files')
+    parser.add_argument('--watch', '-w', action='store_true',
+                        help='Keep running and re-render previews affected by face/font edits')
+    parser.add_argument('--interval', type=float, default=0.25, help='Watch polling interval in seconds')
+    parser.add_argument('--engine', choices=['pil', 'packed'], default='pil', help='Rendering engine')
 
     args = parser.parse_args()
 
     if args.list:
         list_all_watchfaces_and_fonts()
+    elif args.watch:
+        watch_and_regenerate(args.output_dir, args.time, args.date, args.interval, args.engine)
     else:
-        generate_all_configured_watchfaces(args.output_dir, args.time, args.date)
+        generate_all_configured_watchfaces(args.output_dir, args.time, args.date,
+                                           args.workers, args.compress_level, args.archive,
+                                           args.engine)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Golden Frame Regression Check
+Stores a digest of every configured watchface's packed 1-bit frame for a
+fixed set of time/date strings, and checks renderer changes against it
+"""
+
+import hashlib
+import json
+import os
+import sys
+import zipfile
+from PIL import Image
+from render_watchface import GFXFont, Watchface
+from generate_all_previews import compose_configured_watchface
+from watchface_manifest import configured_watchfaces
+
+SCREEN_SIZE = (200, 200)
+
+# Fixed time/date strings (RTCManager format: "H:MM AM/PM", "Mon D")
+GOLDEN_TEXTS = [
+    ("6:24 AM", "Jun 24"),
+    ("12:00 AM", "Jan 1"),
+    ("10:58 PM", "Dec 31"),
+    ("1:07 PM", "Sep 9"),
+]
+
+GOLDEN_DIR = "golden"
+DIGESTS_NAME = "digests.json"
+FRAMES_NAME = "frames.zip"
+
+
+def pack_frame(image):
+    """
+    Pack a '1' image into the device buffer layout: 1 bit per pixel,
+    MSB first, row-major, 1 = white (5000 bytes for 200x200)
+    """
+    return image.convert('1').tobytes()
+
+
+def frame_digest(packed):
+    return hashlib.sha256(packed).hexdigest()
+
+
+def text_key(time_text, date_text):
+    return f"{time_text}|{date_text}"
+
+
+def render_golden_frames(config, texts=GOLDEN_TEXTS, engine='pil'):
+    """Yield (key, packed_frame) for each golden text, parsing the face and fonts once"""
+    watchface = Watchface(config['watchface_path'])
+    time_font = GFXFont(config['time_font'])
+    date_font = GFXFont(config['date_font'])
+
+    for time_text, date_text in texts:
+        image = compose_configured_watchface(config, watchface, time_font, date_font,
+                                             time_text, date_text, engine)
+        yield text_key(time_text, date_text), pack_frame(image)
+
+
+def update_golden(golden_dir=GOLDEN_DIR):
+    """Render all configured watchfaces and store their digests and packed frames"""
+    os.makedirs(golden_dir, exist_ok=True)
+    digests = {}
+
+    with zipfile.ZipFile(os.path.join(golden_dir, FRAMES_NAME), 'w',
+                         compression=zipfile.ZIP_DEFLATED) as frames:
+        for config in configured_watchfaces():
+            digests[config['name']] = {}
+            for index, (key, packed) in enumerate(render_golden_frames(config)):
+                digests[config['name']][key] = frame_digest(packed)
+                frames.writestr(f"{config['name']}/{index}.bin", packed)
+
+    with open(os.path.join(golden_dir, DIGESTS_NAME), 'w') as f:
+        json.dump({'texts': GOLDEN_TEXTS, 'faces': digests}, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+    print(f"Stored golden frames for {len(digests)} watchfaces x {len(GOLDEN_TEXTS)} texts")
+    print(f"Golden directory: {golden_dir}/")
+
+
+def _bit_mask(packed):
+    """'L' mask that is 255 wherever a bit is set in the packed buffer"""
+    return Image.frombytes('1', SCREEN_SIZE, bytes(packed)).convert('L')
+
+
+def diff_frames(expected, actual):
+    """
+    Compare two packed frames.
+    Returns (changed_pixel_count, bounding_box or None, diff_image): the diff
+    image shows the new frame in gray, added black pixels in red and removed
+    black pixels in blue.
+    """
+    changed = bytes(e ^ a for e, a in zip(expected, actual))
+    count = sum(bin(byte).count('1') for byte in changed)
+    bbox = Image.frombytes('1', SCREEN_SIZE, changed).getbbox()
+
+    # Bit 0 is black: added = white before & black now, removed = the reverse
+    new_black = bytes(~a & 0xFF for a in actual)
+    added = bytes(e & ~a & 0xFF for e, a in zip(expected, actual))
+    removed = bytes(~e & a & 0xFF for e, a in zip(expected, actual))
+
+    diff = Image.new('RGB', SCREEN_SIZE, (255, 255, 255))
+    diff.paste((160, 160, 160), mask=_bit_mask(new_black))
+    diff.paste((220, 0, 0), mask=_bit_mask(added))
+    diff.paste((0, 0, 220), mask=_bit_mask(removed))
+    return count, bbox, diff
+
+
+def check_golden(golden_dir=GOLDEN_DIR, diff_dir="golden_diffs", engine='pil'):
+    """Re-render all configured watchfaces and compare against the stored digests"""
+    with open(os.path.join(golden_dir, DIGESTS_NAME), 'r') as f:
+        golden = json.load(f)
+    texts = [tuple(t) for t in golden['texts']]
+    expected_faces = golden['faces']
+
+    mismatches = 0
+    checked = 0
+    frames = None
+
+    for config in configured_watchfaces():
+        name = config['name']
+        if name not in expected_faces:
+            print(f"?  {name}: no golden frames (run with --update)")
+            mismatches += 1
+            continue
+
+        for index, (key, packed) in enumerate(render_golden_frames(config, texts, engine)):
+            checked += 1
+            if frame_digest(packed) == expected_faces[name].get(key):
+                continue
+
+            mismatches += 1
+            if frames is None:
+                frames = zipfile.ZipFile(os.path.join(golden_dir, FRAMES_NAME), 'r')
+            expected = frames.read(f"{name}/{index}.bin")
+            count, bbox, diff = diff_frames(expected, packed)
+
+            os.makedirs(diff_dir, exist_ok=True)
+            diff_path = os.path.join(diff_dir, f"{name}_{index}.png")
+            diff.save(diff_path)
+            print(f"✗ {name} [{key}]: {count} pixels changed in {bbox} → {diff_path}")
+
+    if frames is not None:
+        frames.close()
+
+    for name in sorted(set(expected_faces) - {c['name'] for c in configured_watchfaces()}):
+        print(f"-  {name}: golden frames for a watchface that is no longer configured")
+
+    print(f"\n{checked - mismatches}/{checked} frames match")
+    return mismatches
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check rendered frames against golden digests')
+    parser.add_argument('--update', action='store_true', help='Re-generate the golden digests and frames')
+    parser.add_argument('--golden-dir', default=GOLDEN_DIR, help='Golden digest directory')
+    parser.add_argument('--diff-dir', default='golden_diffs', help='Where to write diff images on mismatch')
+    parser.add_argument('--engine', choices=['pil', 'packed'], default='pil', help='Rendering engine to check')
+
+    args = parser.parse_args()
+
+    if args.update:
+        update_golden(args.golden_dir)
+    else:
+        sys.exit(1 if check_golden(args.golden_dir, args.diff_dir, args.engine) else 0)
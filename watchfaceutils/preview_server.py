@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Live Watchface Preview Server
+Serves the configurator on localhost: frames are re-rendered in memory from
+resident Watchface/GFXFont objects on every position or font change
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from render_watchface import AssetCache, compose_watchface_frame
+from preview_writer import encode_png
+from configure_watchface import (get_available_fonts, get_available_watchfaces,
+                                 get_current_config, generate_watchface_code,
+                                 code_options_from_config)
+
+DEFAULT_PORT = 8200
+DEFAULT_FONT = "FreeMonoBold20pt7b"
+
+# Frames are re-encoded on every change, so favour speed over size
+PREVIEW_COMPRESS_LEVEL = 1
+
+# Colors and bitmap window, with their WatchFace.h defaults
+FACE_FIELDS = {
+    'time_color': 0,
+    'date_color': 0,
+    'bitmap_color': 0,
+    'bitmap_x_start': 0,
+    'bitmap_y_start': 0,
+    'bitmap_x_end': 200,
+    'bitmap_y_end': 200,
+}
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Watchface Configurator</title>
+<style>
+  body { font-family: monospace; margin: 20px; display: flex; gap: 24px; }
+  fieldset { margin-bottom: 10px; }
+  label { display: block; margin: 4px 0; }
+  input[type=number] { width: 60px; }
+  #frame { width: 400px; height: 400px; image-rendering: pixelated; border: 1px solid #888; }
+  pre { background: #eee; padding: 8px; }
+</style>
+</head>
+<body>
+<form id="config">
+  <fieldset><legend>Watchface</legend>
+    <select name="face">%(face_options)s</select>
+  </fieldset>
+  <fieldset><legend>Time</legend>
+    <select name="time_font">%(font_options)s</select>
+    <label>Text <input name="time_text" value="6:24 AM"></label>
+    <label>X <input type="number" name="time_x" value="-1"> Y <input type="number" name="time_y" value="20"></label>
+    <label><input type="checkbox" name="no_ampm"> Remove AM/PM</label>
+    <label>Color %(time_color)s</label>
+  </fieldset>
+  <fieldset><legend>Date</legend>
+    <select name="date_font">%(font_options)s</select>
+    <label>Text <input name="date_text" value="Oct 25"></label>
+    <label>X <input type="number" name="date_x" value="-1"> Y <input type="number" name="date_y" value="190"></label>
+    <label>Color %(date_color)s</label>
+  </fieldset>
+  <fieldset><legend>Layout</legend>
+    <select name="layout"><option value="0">0: single line</option><option value="1">1: two lines</option></select>
+  </fieldset>
+  <input type="hidden" name="bitmap_color" value="0">
+  <input type="hidden" name="bitmap_x_start" value="0">
+  <input type="hidden" name="bitmap_y_start" value="0">
+  <input type="hidden" name="bitmap_x_end" value="200">
+  <input type="hidden" name="bitmap_y_end" value="200">
+</form>
+<div>
+  <img id="frame" alt="preview"><div id="status"></div>
+  <pre id="code"></pre>
+</div>
+<script>
+const form = document.getElementById('config');
+let pending = 0;
+
+function query() {
+  const params = new URLSearchParams(new FormData(form));
+  params.set('no_ampm', form.no_ampm.checked ? '1' : '0');
+  return params.toString();
+}
+
+function refresh() {
+  const q = query();
+  const started = performance.now();
+  const token = ++pending;
+  const img = new Image();
+  img.onload = () => {
+    if (token !== pending) return;
+    document.getElementById('frame').src = img.src;
+    document.getElementById('status').textContent = `${Math.round(performance.now() - started)} ms`;
+  };
+  img.onerror = () => { document.getElementById('status').textContent = 'render failed'; };
+  img.src = '/frame.png?' + q;
+  fetch('/code?' + q).then(r => r.text()).then(t => { document.getElementById('code').textContent = t; });
+}
+
+function loadFace() {
+  fetch('/config?face=' + encodeURIComponent(form.face.value)).then(r => r.json()).then(c => {
+    for (const key of Object.keys(c)) {
+      if (key === 'no_ampm' || !form[key]) continue;
+      form[key].value = c[key];
+    }
+    form.no_ampm.checked = !!c.no_ampm;
+    refresh();
+  });
+}
+
+form.addEventListener('input', e => { if (e.target.name === 'face') loadFace(); else refresh(); });
+loadFace();
+</script>
+</body>
+</html>
+"""
+
+
+class PreviewState:
+    """
+    Shared server state: the resident asset cache and the lists of available
+    watchfaces and fonts. Assets are re-parsed only when their file changes.
+    """
+
+    def __init__(self):
+        self.assets = AssetCache()
+        self.watchfaces = get_available_watchfaces()
+        self.fonts = get_available_fonts()
+        self._mtimes = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, path):
+        mtime = os.stat(path).st_mtime_ns
+        if self._mtimes.get(path) != mtime:
+            self.assets.invalidate(path)
+            self._mtimes[path] = mtime
+
+    def default_config(self, face):
+        """Positions and fonts to start from: the face's current config, else defaults"""
+        font = DEFAULT_FONT if DEFAULT_FONT in self.fonts else self.fonts[0]
+        config = {'time_x': -1, 'time_y': 20, 'date_x': -1, 'date_y': 190, 'layout': 0,
+                  'time_font': font, 'date_font': font, 'no_ampm': False, **FACE_FIELDS}
+        current = get_current_config(face)
+        if current:
+            for key in ('time_x', 'time_y', 'date_x', 'date_y', 'layout'):
+                config[key] = current[key]
+            for key, default in FACE_FIELDS.items():
+                config[key] = current.get(key, default)
+            for key in ('time_font', 'date_font'):
+                if key in current:
+                    config[key] = os.path.splitext(os.path.basename(current[key]))[0]
+            config['no_ampm'] = current.get('noAMPM', False)
+        return config
+
+    def render(self, params):
+        """
+        Render a frame for the request parameters and return the PNG bytes.
+        Uses the packed engine, which follows drawWatchFace's drawBitmap
+        window and bitmap_color handling.
+        """
+        watchface_path = f"../mywatchfaces/{params['face']}.h"
+        time_font_path = f"../myfonts/{params['time_font']}.h"
+        date_font_path = f"../myfonts/{params['date_font']}.h"
+
+        time_text = params['time_text']
+        if params['no_ampm']:
+            time_text = time_text.replace(' AM', '').replace(' PM', '')
+
+        with self._lock:
+            for path in (watchface_path, time_font_path, date_font_path):
+                self._fresh(path)
+            image = compose_watchface_frame(
+                self.assets.get_watchface(watchface_path),
+                self.assets.get_font(time_font_path),
+                self.assets.get_font(date_font_path),
+                params['time_x'], params['time_y'],
+                params['date_x'], params['date_y'],
+                time_text, params['date_text'],
+                layout=params['layout'],
+                time_color=params['time_color'],
+                date_color=params['date_color'],
+                bitmap_x_start=params['bitmap_x_start'],
+                bitmap_y_start=params['bitmap_y_start'],
+                bitmap_x_end=params['bitmap_x_end'],
+                bitmap_y_end=params['bitmap_y_end'],
+                bitmap_color=params['bitmap_color'],
+                engine='packed'
+            )
+        return encode_png(image, PREVIEW_COMPRESS_LEVEL)
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    """Routes: / (page), /frame.png, /code and /config"""
+
+    state = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        try:
+            if url.path == '/':
+                self._send(200, 'text/html; charset=utf-8', self._page().encode())
+            elif url.path == '/config':
+                face = self._choice(query, 'face', self.state.watchfaces)
+                body = json.dumps(self.state.default_config(face)).encode()
+                self._send(200, 'application/json', body)
+            elif url.path == '/frame.png':
+                params = self._params(query)
+                start = time.perf_counter()
+                data = self.state.render(params)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._send(200, 'image/png', data, {'X-Render-Ms': f"{elapsed_ms:.1f}"})
+            elif url.path == '/code':
+                params = self._params(query)
+                options = code_options_from_config(get_current_config(params['face']))
+                for key in FACE_FIELDS:
+                    options[key] = params[key]
+                code = generate_watchface_code(
+                    params['face'],
+                    params['time_x'], params['time_y'], params['time_font'],
+                    params['date_x'], params['date_y'], params['date_font'],
+                    no_ampm=params['no_ampm'], layout=params['layout'],
+                    **options
+                )
+                struct_name = options.get('struct_name') or f"WatchFace_{params['face']}"
+                code += f"\n// Add to the allWatchFaces array in graytimer.ino:\n//   new {struct_name}(),\n"
+                self._send(200, 'text/plain; charset=utf-8', code.encode())
+            else:
+                self._send(404, 'text/plain', b"Not found\n")
+        except ValueError as e:
+            self._send(400, 'text/plain', f"{e}\n".encode())
+
+    def _page(self):
+        def options(items):
+            return ''.join(f'<option value="{item}">{item}</option>' for item in items)
+        def color(name):
+            return (f'<select name="{name}"><option value="0">GxEPD_BLACK</option>'
+                    f'<option value="1">GxEPD_WHITE</option></select>')
+        return PAGE % {'face_options': options(self.state.watchfaces),
+                       'font_options': options(self.state.fonts),
+                       'time_color': color('time_color'),
+                       'date_color': color('date_color')}
+
+    @staticmethod
+    def _choice(query, key, allowed):
+        # Only names from the directory listings are accepted, never raw paths
+        value = query.get(key, '')
+        if value not in allowed:
+            raise ValueError(f"Unknown {key}: {value!r}")
+        return value
+
+    @staticmethod
+    def _int(query, key, default):
+        try:
+            return int(query.get(key, default))
+        except ValueError:
+            raise ValueError(f"{key} must be an integer")
+
+    @staticmethod
+    def _color(query, key):
+        value = query.get(key, '0')
+        if value not in ('0', '1'):
+            raise ValueError(f"{key} must be 0 (black) or 1 (white)")
+        return int(value)
+
+    def _params(self, query):
+        return {
+            'time_color': self._color(query, 'time_color'),
+            'date_color': self._color(query, 'date_color'),
+            'bitmap_color': self._color(query, 'bitmap_color'),
+            'bitmap_x_start': self._int(query, 'bitmap_x_start', 0),
+            'bitmap_y_start': self._int(query, 'bitmap_y_start', 0),
+            'bitmap_x_end': self._int(query, 'bitmap_x_end', 200),
+            'bitmap_y_end': self._int(query, 'bitmap_y_end', 200),
+            'face': self._choice(query, 'face', self.state.watchfaces),
+            'time_font': self._choice(query, 'time_font', self.state.fonts),
+            'date_font': self._choice(query, 'date_font', self.state.fonts),
+            'time_x': self._int(query, 'time_x', -1),
+            'time_y': self._int(query, 'time_y', 20),
+            'date_x': self._int(query, 'date_x', -1),
+            'date_y': self._int(query, 'date_y', 190),
+            'layout': self._int(query, 'layout', 0),
+            'time_text': query.get('time_text', "6:24 AM"),
+            'date_text': query.get('date_text', "Oct 25"),
+            'no_ampm': query.get('no_ampm', '0') in ('1', 'on', 'true'),
+        }
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=DEFAULT_PORT, host='127.0.0.1'):
+    """Run the preview server until interrupted"""
+    PreviewHandler.state = PreviewState()
+    server = ThreadingHTTPServer((host, port), PreviewHandler)
+    print(f"Watchface configurator running at http://{host}:{server.server_port}/")
+    print(f"  {len(PreviewHandler.state.watchfaces)} watchfaces, {len(PreviewHandler.state.fonts)} fonts")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server...")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Live watchface preview server')
+    parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT, help='Port to listen on')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: localhost only)')
+
+    args = parser.parse_args()
+    serve(args.port, args.host)
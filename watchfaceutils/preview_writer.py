@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Pipelined Preview Writer
+Encodes rendered frames as 1-bit PNGs on a bounded pool of writer threads,
+into a directory or a single streaming zip/tar archive
+"""
+
+import io
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_COMPRESS_LEVEL = 6  # Pillow's default zlib level for PNG
+
+
+def encode_png(image, compress_level=DEFAULT_COMPRESS_LEVEL):
+    """Encode an image as a 1-bit PNG and return the bytes"""
+    buffer = io.BytesIO()
+    image.convert('1').save(buffer, format='PNG', compress_level=compress_level)
+    return buffer.getvalue()
+
+
+class PreviewWriter:
+    """
+    Bounded writer pool for rendered previews.
+
+    submit() hands a finished frame to a worker thread, which encodes it and
+    writes it out while the caller renders the next one. At most queue_size
+    frames are pending at a time; submit() blocks beyond that, so memory
+    stays flat however many frames are produced.
+
+    Output goes to loose files in output_dir, or to a single archive if
+    archive is a path ending in .zip, .tar, .tar.gz or .tgz.
+    """
+
+    def __init__(self, output_dir=None, archive=None, workers=DEFAULT_WORKERS,
+                 queue_size=DEFAULT_QUEUE_SIZE, compress_level=DEFAULT_COMPRESS_LEVEL):
+        if output_dir is None and archive is None:
+            raise ValueError("PreviewWriter needs an output_dir or an archive")
+
+        self.output_dir = output_dir
+        self.archive_path = archive
+        self.compress_level = compress_level
+        self.errors = []
+        self.written = 0
+
+        self._slots = threading.BoundedSemaphore(max(1, queue_size))
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._archive = None
+
+        if archive is not None:
+            parent = os.path.dirname(archive)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            if archive.endswith('.zip'):
+                # PNG data is already deflated, so store it as-is
+                self._archive = zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_STORED)
+            elif archive.endswith(('.tar.gz', '.tgz')):
+                self._archive = tarfile.open(archive, 'w|gz')
+            elif archive.endswith('.tar'):
+                self._archive = tarfile.open(archive, 'w|')
+            else:
+                raise ValueError(f"Unsupported archive type: {archive}")
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def submit(self, image, name):
+        """Queue a frame for encoding; blocks while queue_size frames are pending"""
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._encode_and_write, image, name)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _encode_and_write(self, image, name):
+        try:
+            data = encode_png(image, self.compress_level)
+            if self._archive is None:
+                with open(os.path.join(self.output_dir, name), 'wb') as f:
+                    f.write(data)
+            else:
+                # Archive members must be written one at a time
+                with self._lock:
+                    self._write_member(name, data)
+            with self._lock:
+                self.written += 1
+        except Exception as e:
+            with self._lock:
+                self.errors.append((name, e))
+            raise
+
+    def _write_member(self, name, data):
+        if isinstance(self._archive, zipfile.ZipFile):
+            self._archive.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, io.BytesIO(data))
+
+    @property
+    def destination(self):
+        return self.archive_path if self.archive_path is not None else f"{self.output_dir}/"
+
+    def close(self):
+        """Wait for all pending frames and close the archive, if any"""
+        self._pool.shutdown(wait=True)
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
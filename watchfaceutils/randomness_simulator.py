@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Watchface Shuffle Randomness Simulator
+Reimplements the randomSeed()/random(NUM_WATCHFACES) logic from graytimer.ino
+in NumPy and measures how evenly watchfaces are picked
+"""
+
+import json
+import math
+import os
+import time
+import numpy as np
+from battery_simulator import read_firmware_constants
+from watchface_manifest import INO_PATH, read_active_watchfaces
+
+# newlib rand()/srand() as used by the nRF52 Arduino core's random()/randomSeed()
+LCG_MULTIPLIER = np.uint64(6364136223846793005)
+LCG_INCREMENT = np.uint64(1)
+LCG_INITIAL_STATE = 1  # state before any srand() call
+RAND_MAX = 0x7FFFFFFF
+
+# Device resets are spread uniformly over this unixtime range (2024-2027)
+RESET_TIME_RANGE = (1704067200, 1798761600)
+
+RESULTS_PATH = "randomness_results.json"
+DEFAULT_PARAMS = {'devices': 1_000_000, 'days': 1, 'seed': 2025}
+ANALYSIS_MD = "../docs/RANDOMNESS_ANALYSIS.md"
+BEGIN_MARKER = "<!-- BEGIN GENERATED RESULTS (watchfaceutils/randomness_simulator.py) -->"
+END_MARKER = "<!-- END GENERATED RESULTS -->"
+
+
+def firmware_seed(unixtime):
+    """
+    The seed computed in setup(), with unsigned long (32-bit) arithmetic:
+        seed = unixtime * 2654435761; seed ^= second * 16777619;
+        seed ^= minute << 11; seed ^= hour << 19;
+    """
+    unixtime = np.asarray(unixtime, dtype=np.uint64)
+    second = unixtime % np.uint64(60)
+    minute = (unixtime // np.uint64(60)) % np.uint64(60)
+    hour = (unixtime // np.uint64(3600)) % np.uint64(24)
+
+    mask = np.uint64(0xFFFFFFFF)
+    seed = (unixtime * np.uint64(2654435761)) & mask
+    seed ^= (second * np.uint64(16777619)) & mask
+    seed ^= minute << np.uint64(11)
+    seed ^= hour << np.uint64(19)
+    return seed & mask
+
+
+def random_seed(seed):
+    """randomSeed(): srand(seed), except that a zero seed is ignored"""
+    seed = np.asarray(seed, dtype=np.uint64)
+    return np.where(seed != 0, seed, np.uint64(LCG_INITIAL_STATE))
+
+
+def random_next(state, howbig):
+    """random(howbig) = rand() % howbig; returns (new_state, values)"""
+    state = state * LCG_MULTIPLIER + LCG_INCREMENT
+    value = (state >> np.uint64(32)) & np.uint64(RAND_MAX)
+    return state, (value % np.uint64(howbig)).astype(np.int64)
+
+
+def simulate_resets(num_watchfaces, devices, rng):
+    """Initial watchface picked by setup() for `devices` random reset times"""
+    unixtime = rng.integers(*RESET_TIME_RANGE, size=devices, dtype=np.uint64)
+    state = random_seed(firmware_seed(unixtime))
+    state, index = random_next(state, num_watchfaces)
+    return state, index
+
+
+def simulate_cycles(num_watchfaces, state, current, cycles):
+    """
+    Count the watchfaces picked by updateDisplay() over `cycles` refreshes,
+    continuing each device's LCG sequence. Rejection sampling (pick again
+    while equal to the current face) is done only for the devices that need it.
+    """
+    counts = np.zeros(num_watchfaces, dtype=np.int64)
+    draws = 0
+
+    for _ in range(cycles):
+        state, new_index = random_next(state, num_watchfaces)
+        draws += len(state)
+        if num_watchfaces > 1:
+            retry = np.flatnonzero(new_index == current)
+            while retry.size:
+                retry_state, retry_index = random_next(state[retry], num_watchfaces)
+                state[retry] = retry_state
+                new_index[retry] = retry_index
+                draws += retry.size
+                retry = retry[retry_index == current[retry]]
+        current = new_index
+        counts += np.bincount(current, minlength=num_watchfaces)
+
+    return counts, draws
+
+
+def chi_square_pvalue(chi2, dof):
+    """Upper-tail p-value, Wilson-Hilferty approximation (no SciPy needed)"""
+    if dof <= 0:
+        return float('nan')
+    z = ((chi2 / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def distribution_stats(counts):
+    """RMSE and range relative to the uniform expectation, plus chi-square"""
+    counts = np.asarray(counts, dtype=np.float64)
+    expected = counts.sum() / len(counts)
+    ratio = counts / expected
+    chi2 = float(((counts - expected) ** 2 / expected).sum())
+    return {
+        'samples': int(counts.sum()),
+        'rmse_pct': float(np.sqrt(np.mean((ratio - 1) ** 2)) * 100),
+        'min_pct': float(ratio.min() * 100),
+        'max_pct': float(ratio.max() * 100),
+        'chi2': chi2,
+        'dof': len(counts) - 1,
+        'p_value': chi_square_pvalue(chi2, len(counts) - 1),
+    }
+
+
+def cycles_per_day(full_refresh_interval):
+    """Watchface changes per day: one at every minute of the hour where minute % interval == 0"""
+    return 24 * sum(1 for minute in range(60) if minute % full_refresh_interval == 0)
+
+
+def run_simulation(num_watchfaces, devices=1_000_000, days=1, seed=2025, full_refresh_interval=10):
+    """Simulate `devices` resets followed by `days` of cycling each"""
+    cycles = days * cycles_per_day(full_refresh_interval)
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    state, initial = simulate_resets(num_watchfaces, devices, rng)
+    initial_counts = np.bincount(initial, minlength=num_watchfaces)
+    cycle_counts, draws = simulate_cycles(num_watchfaces, state, initial.copy(), cycles)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'num_watchfaces': num_watchfaces,
+        'devices': devices,
+        'days': days,
+        'seed': seed,
+        'full_refresh_interval': full_refresh_interval,
+        'initial': distribution_stats(initial_counts),
+        'continuous': distribution_stats(cycle_counts),
+        'draws_per_cycle': draws / (devices * cycles),
+        'elapsed_sec': elapsed,
+    }
+
+
+def load_results(results_path=RESULTS_PATH):
+    if not os.path.exists(results_path):
+        return None
+    with open(results_path, 'r') as f:
+        return json.load(f)
+
+
+def format_results(results):
+    """Plain-text report in the style of RANDOMNESS_ANALYSIS.md"""
+    lines = []
+    for label, key in (("Initial Selection", 'initial'), ("Continuous Operation", 'continuous')):
+        stats = results[key]
+        lines.append(f"{label} ({stats['samples']:,} picks):")
+        lines.append(f"  - RMSE: {stats['rmse_pct']:.3f}%")
+        lines.append(f"  - Range: {stats['min_pct']:.1f}-{stats['max_pct']:.1f}% of expected")
+        lines.append(f"  - Chi-squared: {stats['chi2']:.1f} (dof {stats['dof']}, p ≈ {stats['p_value']:.3f})")
+        lines.append("")
+    lines.append(f"Average random() calls per cycle: {results['draws_per_cycle']:.4f}")
+    return "\n".join(lines)
+
+
+def write_analysis_results(results, analysis_md=ANALYSIS_MD):
+    """Replace the generated results block in RANDOMNESS_ANALYSIS.md"""
+    block = "\n".join([
+        BEGIN_MARKER,
+        "",
+        "### Simulated Results (current firmware)",
+        "",
+        f"{results['num_watchfaces']} watchfaces, {results['devices']:,} simulated device resets, "
+        f"{results['days']} day(s) of cycling each, with a new watchface whenever "
+        f"minute % {results['full_refresh_interval']} == 0 (seed {results['seed']}). "
+        "Regenerate with `python3 randomness_simulator.py` in `watchfaceutils/`.",
+        "",
+        "```",
+        format_results(results),
+        "```",
+        "",
+        END_MARKER,
+    ])
+
+    with open(analysis_md, 'r') as f:
+        content = f.read()
+
+    if BEGIN_MARKER in content and END_MARKER in content:
+        start = content.index(BEGIN_MARKER)
+        end = content.index(END_MARKER) + len(END_MARKER)
+        content = content[:start] + block + content[end:]
+    elif "## Technical Implementation" in content:
+        anchor = content.index("## Technical Implementation")
+        anchor = content.rindex("---", 0, anchor)
+        content = content[:anchor] + block + "\n\n" + content[anchor:]
+    else:
+        content = content.rstrip('\n') + "\n\n" + block + "\n"
+
+    with open(analysis_md, 'w') as f:
+        f.write(content)
+
+
+def ensure_results(devices=None, days=None, seed=None, force=False,
+                   ino_path=INO_PATH, results_path=RESULTS_PATH, analysis_md=ANALYSIS_MD):
+    """
+    Return simulation results for the current allWatchFaces[] size and
+    FULL_REFRESH_INTERVAL. Parameters left as None keep the cached run's
+    values (or the defaults if nothing is cached), so a plain call only
+    re-runs when the firmware changed. The cached results are reused unless
+    the watchface count, the interval or an explicitly given parameter
+    differs; on a re-run the results file and analysis doc are updated.
+    """
+    num_watchfaces = len(read_active_watchfaces(ino_path))
+    cached = load_results(results_path)
+
+    full_refresh_interval = read_firmware_constants(ino_path)['FULL_REFRESH_INTERVAL']
+
+    params = {'num_watchfaces': num_watchfaces, 'full_refresh_interval': full_refresh_interval}
+    for key, value in (('devices', devices), ('days', days), ('seed', seed)):
+        if value is None:
+            value = cached.get(key, DEFAULT_PARAMS[key]) if cached else DEFAULT_PARAMS[key]
+        params[key] = value
+
+    if not force and cached and all(cached.get(k) == v for k, v in params.items()):
+        return cached, False
+
+    if cached and cached.get('num_watchfaces') != num_watchfaces:
+        print(f"allWatchFaces[] changed size: {cached.get('num_watchfaces')} → {num_watchfaces}, re-running")
+
+    results = run_simulation(num_watchfaces, params['devices'], params['days'], params['seed'],
+                             full_refresh_interval)
+    with open(results_path, 'w') as f:
+        # Timing is left out so the stored results are reproducible
+        json.dump({k: v for k, v in results.items() if k != 'elapsed_sec'}, f,
+                  indent=2, sort_keys=True)
+        f.write('\n')
+    if analysis_md and os.path.exists(analysis_md):
+        write_analysis_results(results, analysis_md)
+    return results, True
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Simulate watchface shuffle randomness')
+    parser.add_argument('--devices', type=int, help='Simulated device resets (default: cached run, else 1000000)')
+    parser.add_argument('--days', type=int, help='Days of cycling per device, at FULL_REFRESH_INTERVAL from graytimer.ino '
+                        '(default: cached run, else 1)')
+    parser.add_argument('--seed', type=int, help='Seed for the simulated reset times (default: cached run, else 2025)')
+    parser.add_argument('--force', '-f', action='store_true', help='Re-run even if cached results are current')
+
+    args = parser.parse_args()
+    results, ran = ensure_results(args.devices, args.days, args.seed, args.force)
+
+    print(f"=== {results['num_watchfaces']} watchfaces, {results['devices']:,} devices x {results['days']} day(s) ===")
+    if ran:
+        print(f"Simulated in {results['elapsed_sec']:.1f}s\n")
+    else:
+        print(f"Cached results ({RESULTS_PATH}); use --force to re-run\n")
+    print(format_results(results))
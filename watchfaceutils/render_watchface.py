@@ -5,10 +5,11 @@ Renders watchface previews from .h files to PNG images
 """
 
 import re
-import os
 from PIL import Image, ImageDraw
 from pathlib import Path
 import argparse
+from watchface_manifest import configured_watchfaces
+from preview_writer import PreviewWriter
 
 class GFXFont:
     """Parser for Adafruit GFX font format (.h files)"""
@@ -21,6 +22,7 @@ class GFXFont:
         self.first_char = 0x20
         self.last_char = 0x7E
         self.y_advance = 0
+        self._glyph_rows = {}
         self._parse_font()
 
     def _parse_font(self):
@@ -115,6 +117,27 @@ class GFXFont:
             cursor_x = self.render_char(char, cursor_x, y, image_draw, color)
         return cursor_x
 
+    def glyph_rows(self, glyph_index):
+        """
+        A glyph's bitmap as one int per row (leftmost pixel in the highest of
+        `width` bits), unpacked once from the continuous bit stream and cached
+        """
+        rows = self._glyph_rows.get(glyph_index)
+        if rows is None:
+            glyph = self.glyphs[glyph_index]
+            width = glyph['width']
+            height = glyph['height']
+            nbytes = (width * height + 7) // 8
+            offset = glyph['bitmapOffset']
+            data = bytes(self.bitmap[offset:offset + nbytes]).ljust(nbytes, b'\0')
+
+            bits = int.from_bytes(data, 'big')
+            nbits = nbytes * 8
+            mask = (1 << width) - 1
+            rows = [(bits >> (nbits - (h + 1) * width)) & mask for h in range(height)]
+            self._glyph_rows[glyph_index] = rows
+        return rows
+
     def get_text_bounds(self, text):
         """
         Calculate text bounding box similar to Adafruit GFX getTextBounds()
@@ -202,13 +225,115 @@ class Watchface:
         return image
 
 
+class PackedFramebuffer:
+    """
+    1-bit canvas in the device buffer layout: a bytearray of packed rows,
+    MSB first, 1 = white (5000 bytes for 200x200).
+
+    Drawing works a whole row at a time: source rows are shifted into place
+    and OR-ed in (white) or AND-NOT-ed out (black), the way GxEPD2 writes
+    into its buffer. Nothing is unpacked until to_image().
+    """
+
+    def __init__(self, width=200, height=200, color=1):
+        self.width = width
+        self.height = height
+        self.stride = (width + 7) // 8
+        self.buffer = bytearray([0xFF if color else 0x00]) * (self.stride * height)
+        self._row_bits = self.stride * 8
+        # Visible columns only (excludes row padding when width % 8 != 0)
+        self._visible = ((1 << width) - 1) << (self._row_bits - width)
+
+    def fill(self, color):
+        self.buffer[:] = bytes([0xFF if color else 0x00]) * len(self.buffer)
+
+    def blit_row(self, x, y, bits, width, color):
+        """Draw the set bits of a `width`-bit row at (x, y) in color (0 = black, 1 = white)"""
+        if not 0 <= y < self.height or not bits:
+            return
+
+        shift = self._row_bits - x - width
+        bits = (bits << shift if shift >= 0 else bits >> -shift) & self._visible
+        if not bits:
+            return
+
+        start = y * self.stride
+        end = start + self.stride
+        row = int.from_bytes(self.buffer[start:end], 'big')
+        row = row | bits if color else row & ~bits
+        self.buffer[start:end] = row.to_bytes(self.stride, 'big')
+
+    def draw_bitmap(self, x, y, bitmap, width, height, color=0):
+        """
+        Adafruit GFX drawBitmap(): draw the set bits of a width x height
+        bitmap (rows padded to whole bytes) at (x, y); clear bits are left as-is
+        """
+        src_stride = (width + 7) // 8
+        padding = src_stride * 8 - width
+        data = bytes(bitmap)
+
+        for h in range(height):
+            row = data[h * src_stride:(h + 1) * src_stride].ljust(src_stride, b'\0')
+            self.blit_row(x, y + h, int.from_bytes(row, 'big') >> padding, width, color)
+
+    def draw_text(self, font, text, x, y, color=0):
+        """Draw text with a GFXFont at cursor (x, y); returns the new cursor x"""
+        for char in text:
+            char_code = ord(char)
+            if char_code < font.first_char or char_code > font.last_char:
+                continue
+
+            glyph_index = char_code - font.first_char
+            if glyph_index >= len(font.glyphs):
+                continue
+
+            glyph = font.glyphs[glyph_index]
+            gx = x + glyph['xOffset']
+            gy = y + glyph['yOffset']
+            for h, bits in enumerate(font.glyph_rows(glyph_index)):
+                self.blit_row(gx, gy + h, bits, glyph['width'], color)
+            x += glyph['xAdvance']
+        return x
+
+    def tobytes(self):
+        return bytes(self.buffer)
+
+    def to_image(self):
+        """Unpack into a PIL '1' image"""
+        return Image.frombytes('1', (self.width, self.height), bytes(self.buffer))
+
+
+class AssetCache:
+    """Keeps parsed GFXFont and Watchface objects resident, keyed by file path"""
+
+    def __init__(self):
+        self.fonts = {}
+        self.watchfaces = {}
+
+    def get_font(self, font_path):
+        if font_path not in self.fonts:
+            self.fonts[font_path] = GFXFont(font_path)
+        return self.fonts[font_path]
+
+    def get_watchface(self, watchface_path):
+        if watchface_path not in self.watchfaces:
+            self.watchfaces[watchface_path] = Watchface(watchface_path)
+        return self.watchfaces[watchface_path]
+
+    def invalidate(self, path):
+        """Drop a cached asset so the next get re-parses it from disk"""
+        self.fonts.pop(path, None)
+        self.watchfaces.pop(path, None)
+
+
 def render_watchface_preview(watchface_path, time_font_path, date_font_path,
                             time_x, time_y, date_x, date_y,
                             time_text="6:24 AM", date_text="Oct 25",
                             output_path=None, layout=0,
                             time_color=0, date_color=0,
                             bitmap_x_start=0, bitmap_y_start=0,
-                            bitmap_x_end=200, bitmap_y_end=200):
+                            bitmap_x_end=200, bitmap_y_end=200,
+                            save=True, bitmap_color=0, engine='pil'):
     """
     Render a complete watchface preview with time and date
 
@@ -226,31 +351,44 @@ def render_watchface_preview(watchface_path, time_font_path, date_font_path,
         date_color: 0 = black, 1 = white (inverted)
         bitmap_x_start, bitmap_y_start: Bitmap offset
         bitmap_x_end, bitmap_y_end: Bitmap size
+        save: Write the PNG to output_path (False returns the image only)
+        bitmap_color: 0 = black, 1 = white (packed engine only)
+        engine: 'pil' (default) draws into a PIL image; 'packed' draws into a
+            PackedFramebuffer like the device buffer and unpacks it at the end
     """
-    screenW = 200
-    screenH = 200
-
-    # Parse watchface
+    # Parse watchface and fonts
     watchface = Watchface(watchface_path)
+    time_font = GFXFont(time_font_path)
+    date_font = GFXFont(date_font_path)
 
-    # Render bitmap with cropping support
-    if bitmap_x_start != 0 or bitmap_y_start != 0 or bitmap_x_end != 200 or bitmap_y_end != 200:
-        # Create full white canvas
-        image = Image.new('1', (screenW, screenH), 1)
-        # Render watchface (will be cropped)
-        wf_image = watchface.render()
-        # Paste cropped region
-        image.paste(wf_image.crop((bitmap_x_start, bitmap_y_start, bitmap_x_end, bitmap_y_end)),
-                   (bitmap_x_start, bitmap_y_start))
-    else:
-        image = watchface.render()
+    image = compose_watchface_frame(
+        watchface, time_font, date_font,
+        time_x, time_y, date_x, date_y,
+        time_text, date_text,
+        layout=layout,
+        time_color=time_color, date_color=date_color,
+        bitmap_x_start=bitmap_x_start, bitmap_y_start=bitmap_y_start,
+        bitmap_x_end=bitmap_x_end, bitmap_y_end=bitmap_y_end,
+        bitmap_color=bitmap_color, engine=engine
+    )
 
-    draw = ImageDraw.Draw(image)
+    # Save output
+    if save:
+        if output_path is None:
+            output_path = f"{watchface.watchface_name}.png"
+
+        image.save(output_path)
+        print(f"Saved: {output_path}")
+    return image
 
-    # Parse fonts
-    time_font = GFXFont(time_font_path)
-    date_font = GFXFont(date_font_path)
 
+def text_cursors(time_font, date_font, time_text, date_text,
+                 time_x, time_y, date_x, date_y, layout=0,
+                 screenW=200, screenH=200):
+    """
+    Cursor positions for the time and date text, as computed in drawWatchFace
+    Returns (drawX1, drawY1, drawX2, drawY2)
+    """
     # Get text bounds (matching GFX getTextBounds behavior)
     x1, y1, w1, h1 = time_font.get_text_bounds(time_text)
     x2, y2, w2, h2 = date_font.get_text_bounds(date_text)
@@ -290,10 +428,6 @@ def render_watchface_preview(watchface_path, time_font_path, date_font_path,
             # Percentage-based position
             drawY2 = int(screenH * (date_y / 100.0)) - y2
 
-        # Render text
-        time_font.render_text(time_text, drawX1, drawY1, draw, time_color)
-        date_font.render_text(date_text, drawX2, drawY2, draw, date_color)
-
     else:
         # Single-line layout (time and date on same line)
         totalW = w1 + w2 + 6  # 6px gap
@@ -309,55 +443,126 @@ def render_watchface_preview(watchface_path, time_font_path, date_font_path,
         else:
             baselineY = int(screenH * (time_y / 100.0))
 
-        # Render time and date side by side
-        time_font.render_text(time_text, originX - x1, baselineY - y1, draw, time_color)
-        date_font.render_text(date_text, originX + w1 + 6 - x2, baselineY - y2, draw, date_color)
+        # Time and date side by side
+        drawX1, drawY1 = originX - x1, baselineY - y1
+        drawX2, drawY2 = originX + w1 + 6 - x2, baselineY - y2
 
-    # Save output
-    if output_path is None:
-        output_path = f"{watchface.watchface_name}.png"
+    return drawX1, drawY1, drawX2, drawY2
+
+
+def compose_watchface_frame(watchface, time_font, date_font,
+                            time_x, time_y, date_x, date_y,
+                            time_text="6:24 AM", date_text="Oct 25",
+                            layout=0, time_color=0, date_color=0,
+                            bitmap_x_start=0, bitmap_y_start=0,
+                            bitmap_x_end=200, bitmap_y_end=200,
+                            bitmap_color=0, engine='pil'):
+    """
+    Render a watchface frame from already-parsed Watchface/GFXFont objects.
+    Same arguments as render_watchface_preview; returns the PIL image.
+    """
+    if engine == 'packed':
+        return compose_packed_frame(
+            watchface, time_font, date_font,
+            time_x, time_y, date_x, date_y,
+            time_text, date_text,
+            layout=layout, time_color=time_color, date_color=date_color,
+            bitmap_x_start=bitmap_x_start, bitmap_y_start=bitmap_y_start,
+            bitmap_x_end=bitmap_x_end, bitmap_y_end=bitmap_y_end,
+            bitmap_color=bitmap_color
+        ).to_image()
+    if engine != 'pil':
+        raise ValueError(f"Unknown render engine: {engine}")
+
+    screenW = 200
+    screenH = 200
+
+    # Render bitmap with cropping support
+    if bitmap_x_start != 0 or bitmap_y_start != 0 or bitmap_x_end != 200 or bitmap_y_end != 200:
+        # Create full white canvas
+        image = Image.new('1', (screenW, screenH), 1)
+        # Render watchface (will be cropped)
+        wf_image = watchface.render()
+        # Paste cropped region
+        image.paste(wf_image.crop((bitmap_x_start, bitmap_y_start, bitmap_x_end, bitmap_y_end)),
+                   (bitmap_x_start, bitmap_y_start))
+    else:
+        image = watchface.render()
+
+    draw = ImageDraw.Draw(image)
+
+    drawX1, drawY1, drawX2, drawY2 = text_cursors(
+        time_font, date_font, time_text, date_text,
+        time_x, time_y, date_x, date_y, layout, screenW, screenH
+    )
+
+    # Render text
+    time_font.render_text(time_text, drawX1, drawY1, draw, time_color)
+    date_font.render_text(date_text, drawX2, drawY2, draw, date_color)
 
-    image.save(output_path)
-    print(f"Saved: {output_path}")
     return image
 
 
+def compose_packed_frame(watchface, time_font, date_font,
+                         time_x, time_y, date_x, date_y,
+                         time_text="6:24 AM", date_text="Oct 25",
+                         layout=0, time_color=0, date_color=0,
+                         bitmap_x_start=0, bitmap_y_start=0,
+                         bitmap_x_end=200, bitmap_y_end=200,
+                         bitmap_color=0):
+    """
+    Render a watchface frame into a PackedFramebuffer, following drawWatchFace:
+    fillScreen(WHITE), drawBitmap(x_start, y_start, bitmap, x_end, y_end,
+    bitmap_color) - x_end/y_end are the bitmap's width/height, not a crop
+    window - then the two text strings.
+    """
+    framebuffer = PackedFramebuffer()
+    framebuffer.draw_bitmap(bitmap_x_start, bitmap_y_start, watchface.bitmap,
+                            bitmap_x_end, bitmap_y_end, bitmap_color)
+
+    drawX1, drawY1, drawX2, drawY2 = text_cursors(
+        time_font, date_font, time_text, date_text,
+        time_x, time_y, date_x, date_y, layout,
+        framebuffer.width, framebuffer.height
+    )
+
+    framebuffer.draw_text(time_font, time_text, drawX1, drawY1, time_color)
+    framebuffer.draw_text(date_font, date_text, drawX2, drawY2, date_color)
+    return framebuffer
+
+
 def generate_all_configured_watchfaces(output_dir="previews"):
     """Generate preview images for all configured watchfaces"""
 
-    # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Configured watchfaces (from epaper_watch.ino)
-    watchfaces = [
-        {
-            'name': 'atat',
-            'watchface': '../mywatchfaces/atat.h',
-            'time_font': '../myfonts/StarJedi_DGRW10pt7b.h',
-            'date_font': '../myfonts/StarJedi_DGRW10pt7b.h',
-            'time_x': -1,
-            'time_y': 5,
-            'date_x': 0,  # Will be calculated based on watchface defaults
-            'date_y': 0,
-        },
-        # Add more as you configure them...
-    ]
-
-    for wf in watchfaces:
-        try:
-            output_path = os.path.join(output_dir, f"{wf['name']}.png")
-            render_watchface_preview(
-                wf['watchface'],
-                wf['time_font'],
-                wf['date_font'],
-                wf['time_x'],
-                wf['time_y'],
-                wf.get('date_x', 0),
-                wf.get('date_y', 190),
-                output_path=output_path
-            )
-        except Exception as e:
-            print(f"Error rendering {wf['name']}: {e}")
+    # Configured watchfaces (from allWatchFaces[] in graytimer.ino)
+    # PNG encoding and writes run on the PreviewWriter pool
+    with PreviewWriter(output_dir) as writer:
+        for wf in configured_watchfaces():
+            try:
+                image = render_watchface_preview(
+                    wf['watchface_path'],
+                    wf['time_font'],
+                    wf['date_font'],
+                    wf['time_x'],
+                    wf['time_y'],
+                    wf['date_x'],
+                    wf['date_y'],
+                    layout=wf['layout'],
+                    time_color=wf['time_color'],
+                    date_color=wf['date_color'],
+                    bitmap_x_start=wf.get('bitmap_x_start', 0),
+                    bitmap_y_start=wf.get('bitmap_y_start', 0),
+                    bitmap_x_end=wf.get('bitmap_x_end', 200),
+                    bitmap_y_end=wf.get('bitmap_y_end', 200),
+                    save=False
+                )
+                writer.submit(image, f"{wf['name']}.png")
+            except Exception as e:
+                print(f"Error rendering {wf['name']}: {e}")
+
+    for name, e in writer.errors:
+        print(f"Error writing {name}: {e}")
+    print(f"Saved {writer.written} previews to {writer.destination}")
 
 
 def interactive_mode(watchface_path, font_path):
@@ -423,6 +628,7 @@ if __name__ == '__main__':
     parser.add_argument('--output', '-o', help='Output PNG path')
     parser.add_argument('--interactive', '-i', action='store_true', help='Interactive mode')
     parser.add_argument('--all', action='store_true', help='Generate all configured watchfaces')
+    parser.add_argument('--engine', choices=['pil', 'packed'], default='pil', help='Rendering engine')
 
     args = parser.parse_args()
 
@@ -448,7 +654,8 @@ if __name__ == '__main__':
             args.date_y,
             args.time_text,
             args.date_text,
-            args.output
+            args.output,
+            engine=args.engine
         )
     else:
         parser.print_help()
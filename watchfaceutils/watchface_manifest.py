@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Watchface Manifest
+Single-pass extraction of WatchFace_* struct fields and a cached manifest
+of the watchfaces configured in graytimer.ino
+"""
+
+import re
+import os
+import json
+from pathlib import Path
+
+WATCHFACE_DIR = "../mywatchfaces"
+FONT_DIR = "../myfonts"
+INO_PATH = "../graytimer.ino"
+MANIFEST_PATH = ".watchface_manifest.json"
+MANIFEST_VERSION = 1
+
+STRUCT_PATTERN = re.compile(r'struct\s+(WatchFace_\w+)\s*:\s*public\s+WatchFace\s*\{')
+FIELD_PATTERN = re.compile(r'\b(\w+)\s*=\s*([^;]+?)\s*;')
+BITMAP_PATTERN = re.compile(r'const unsigned char (\w+_bitmap_\w+) \[\] PROGMEM')
+COMMENT_PATTERN = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
+ACTIVE_LIST_PATTERN = re.compile(r'allWatchFaces\[\]\s*=\s*\{(.*?)\};', re.DOTALL)
+ACTIVE_ENTRY_PATTERN = re.compile(r'new\s+(WatchFace_\w+)\s*\(')
+
+# Fields copied straight into the config dict as ints
+INT_FIELDS = {
+    'text1x': 'time_x',
+    'text1y': 'time_y',
+    'text2x': 'date_x',
+    'text2y': 'date_y',
+    'layout': 'layout',
+    'bitmap_x_start': 'bitmap_x_start',
+    'bitmap_y_start': 'bitmap_y_start',
+    'bitmap_x_end': 'bitmap_x_end',
+    'bitmap_y_end': 'bitmap_y_end',
+}
+
+# Color fields (GxEPD_BLACK=0, GxEPD_WHITE=1)
+COLOR_FIELDS = {
+    'text1color': 'time_color',
+    'text2color': 'date_color',
+    'bitmap_color': 'bitmap_color',
+}
+
+
+def tokenize_watchface_struct(content):
+    """
+    Extract the WatchFace_* struct name and its constructor assignments.
+
+    The struct sits after the bitmap array, so it is located by scanning back
+    from the end of the file; only the struct body is tokenized and the bitmap
+    text is never re-read. Returns (struct_name, {field: raw_value}) or
+    (None, {}) if the file has no WatchFace struct.
+    """
+    start = content.rfind('struct WatchFace_')
+    if start < 0:
+        return None, {}
+
+    match = STRUCT_PATTERN.match(content, start)
+    if not match:
+        return None, {}
+
+    body = COMMENT_PATTERN.sub('', content[match.end():])
+    return match.group(1), dict(FIELD_PATTERN.findall(body))
+
+
+def config_from_fields(watchface_h_path, struct_name, fields, font_dir=FONT_DIR):
+    """Build a preview config dict from tokenized struct fields"""
+    config = {
+        'name': Path(watchface_h_path).stem,
+        'watchface_path': watchface_h_path,
+        'struct': struct_name,
+        'time_x': -1,  # Default to center
+        'time_y': -1,
+        'date_x': -1,
+        'date_y': -1,
+        'layout': 0,   # Default to single-line (matches WatchFace.h default)
+        'time_color': 0,
+        'date_color': 0,
+    }
+
+    for field, value in fields.items():
+        if field in INT_FIELDS:
+            try:
+                config[INT_FIELDS[field]] = int(value)
+            except ValueError:
+                pass
+        elif field in COLOR_FIELDS:
+            config[COLOR_FIELDS[field]] = 1 if value == 'GxEPD_WHITE' else 0
+        elif field == 'noAMPM':
+            config['noAMPM'] = value == 'true'
+        elif field in ('text1font', 'text2font') and value.startswith('&'):
+            key = 'time_font' if field == 'text1font' else 'date_font'
+            config[key] = f"{font_dir}/{value[1:].strip()}.h"
+        elif field == 'bitmap':
+            config['bitmap'] = value
+
+    return config
+
+
+def parse_watchface_config(watchface_h_path, font_dir=FONT_DIR):
+    """
+    Parse a watchface .h file to extract configuration
+    Returns dict with font paths and positions
+    """
+    with open(watchface_h_path, 'r') as f:
+        content = f.read()
+
+    struct_name, fields = tokenize_watchface_struct(content)
+    return config_from_fields(watchface_h_path, struct_name, fields, font_dir)
+
+
+def read_active_watchfaces(ino_path=INO_PATH):
+    """Return the WatchFace_* struct names listed in allWatchFaces[], in order"""
+    with open(ino_path, 'r') as f:
+        content = COMMENT_PATTERN.sub('', f.read())
+
+    match = ACTIVE_LIST_PATTERN.search(content)
+    if not match:
+        return []
+    return ACTIVE_ENTRY_PATTERN.findall(match.group(1))
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_manifest(watchface_dir=WATCHFACE_DIR, ino_path=INO_PATH,
+                  manifest_path=MANIFEST_PATH, font_dir=FONT_DIR):
+    """
+    Load the watchface manifest, re-parsing only files whose mtime/size changed.
+
+    Returns a dict with:
+        active: configs for allWatchFaces[] entries, in firmware order
+        missing: struct names in allWatchFaces[] with no matching .h file
+        unused: configs for .h files not referenced by allWatchFaces[]
+    """
+    cached = {}
+    if manifest_path and os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        if cached.get('version') != MANIFEST_VERSION or cached.get('font_dir') != font_dir:
+            cached = {}
+
+    dirty = False
+
+    # Active list from graytimer.ino
+    ino_key = _stat_key(ino_path)
+    ino_entry = cached.get('ino', {})
+    if ino_entry.get('path') == ino_path and ino_entry.get('stat') == ino_key:
+        active_structs = ino_entry['active']
+    else:
+        active_structs = read_active_watchfaces(ino_path)
+        ino_entry = {'path': ino_path, 'stat': ino_key, 'active': active_structs}
+        dirty = True
+
+    # Per-file struct configs
+    cached_files = cached.get('files', {})
+    files = {}
+    for wf_path in sorted(str(p) for p in Path(watchface_dir).glob("*.h")):
+        key = _stat_key(wf_path)
+        entry = cached_files.get(wf_path)
+        if entry is None or entry['stat'] != key:
+            entry = {'stat': key, 'config': parse_watchface_config(wf_path, font_dir)}
+            dirty = True
+        files[wf_path] = entry
+    if set(files) != set(cached_files):
+        dirty = True
+
+    if dirty and manifest_path:
+        with open(manifest_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'font_dir': font_dir,
+                       'ino': ino_entry, 'files': files}, f, indent=1, sort_keys=True)
+
+    by_struct = {}
+    for entry in files.values():
+        struct_name = entry['config'].get('struct')
+        if struct_name:
+            by_struct.setdefault(struct_name, entry['config'])
+
+    active = []
+    missing = []
+    seen = set()
+    for struct_name in active_structs:
+        if struct_name in by_struct:
+            if struct_name not in seen:
+                active.append(by_struct[struct_name])
+        else:
+            missing.append(struct_name)
+        seen.add(struct_name)
+
+    unused = [entry['config'] for entry in files.values()
+              if entry['config'].get('struct') not in seen]
+
+    return {'active': active, 'missing': missing, 'unused': unused}
+
+
+def configured_watchfaces(**kwargs):
+    """Configs for the watchfaces in allWatchFaces[], in firmware order"""
+    return load_manifest(**kwargs)['active']
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show the parsed watchface manifest')
+    parser.add_argument('--ino', default=INO_PATH, help='Path to graytimer.ino')
+    parser.add_argument('--json', action='store_true', help='Print the active configs as JSON')
+
+    args = parser.parse_args()
+    manifest = load_manifest(ino_path=args.ino)
+
+    if args.json:
+        print(json.dumps(manifest['active'], indent=2))
+    else:
+        print(f"=== Active Watchfaces ({len(manifest['active'])}) ===")
+        for config in manifest['active']:
+            print(f"  - {config['name']} ({config['struct']})")
+        if manifest['missing']:
+            print("\n=== Missing (in allWatchFaces[] but no .h file) ===")
+            for struct_name in manifest['missing']:
+                print(f"  - {struct_name}")
+        if manifest['unused']:
+            print("\n=== Unused (.h file not in allWatchFaces[]) ===")
+            for config in manifest['unused']:
+                print(f"  - {config['name']} ({config['struct']})")